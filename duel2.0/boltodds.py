@@ -1,5 +1,5 @@
 import websocket
-import json
+import orjson
 import time
 import logging
 import threading
@@ -9,7 +9,6 @@ from dotenv import load_dotenv
 import os
 load_dotenv()
 
-import logging
 # Create logs directory
 os.makedirs("logs", exist_ok=True)
 logger = logging.getLogger("Boltodds")
@@ -38,7 +37,13 @@ class BoltOddsStreamClient:
         self.handlers = {
             "line_update": self.handle_line_update,
         }
-        self.boltoddsevent = []
+        # Keyed by the composite event id so duplicate detection is O(1);
+        # capped so a multi-day run can't grow memory without bound
+        self.boltoddsevent = {}
+        self.max_events = 10_000
+        # Bumped on every store mutation so the matcher can tell whether
+        # anything new arrived since its last pass
+        self.updates = 0
         self.lock = threading.Lock()  
         self.thread = None
 
@@ -79,10 +84,11 @@ class BoltOddsStreamClient:
     def on_message(self, ws, message):
         """Called when a message is received from the server"""
         try:
-            data = json.loads(message)
+            # orjson parses in C, noticeably faster on the firehose
+            data = orjson.loads(message)
             
             if not self.subscribed:
-                logger.info(f"Ack message: {message}")
+                logger.info("Ack message: %s", message)
                 self.send_subscription(ws)
                 return
             
@@ -94,18 +100,18 @@ class BoltOddsStreamClient:
             if handler:
                 handler(data)
                 
-        except json.JSONDecodeError as e:
-            logger.info(f"Error parsing JSON: {e}")
+        except orjson.JSONDecodeError as e:
+            logger.info("Error parsing JSON: %s", e)
         except Exception as e:
-            logger.info(f"Error processing message: {e}")
+            logger.info("Error processing message: %s", e)
     
     def on_error(self, ws, error):
         """Called when an error occurs"""
-        logger.info(f"WebSocket error: {error}")
+        logger.info("WebSocket error: %s", error)
     
     def on_close(self, ws, close_status_code, close_msg):
         """Called when the WebSocket connection is closed"""
-        logger.info(f"Connection closed — status: {close_status_code}, reason: {close_msg}")
+        logger.info("Connection closed — status: %s, reason: %s", close_status_code, close_msg)
         self.subscribed = False
         
         if self.should_reconnect:
@@ -124,7 +130,7 @@ class BoltOddsStreamClient:
                            '1st Half Total Points', 'Total Points']
             }
         }
-        ws.send(json.dumps(subscribe_message))
+        ws.send(orjson.dumps(subscribe_message).decode())
         self.subscribed = True
 
     def handle_line_update(self, data):
@@ -134,19 +140,23 @@ class BoltOddsStreamClient:
         outcomes = inner_data.get("outcomes", {})
         when_utc = est_to_utc(info.get("when"))
 
+        # League normalization (fuzzy matching) and the composite id only
+        # depend on the event, not on the outcome, so compute them once per
+        # update instead of per outcome
+        bolt_league = inner_data.get('sport')
+        clean_bolt_league = normalize_league(bolt_league)
+        sport = get_sport_from_league(clean_bolt_league)
+
+        # logger.info(
+        #             "Parsed sport data | bolt_league=%s | clean_bolt_league=%s | sport=%s",
+        #             bolt_league,
+        #             clean_bolt_league,
+        #             sport,
+        #         )
+
+        id = f"{sport}|{inner_data.get('home_team')}|{inner_data.get('away_team')}|{when_utc}"
+
         for _, outcome_data in outcomes.items():
-            bolt_league = inner_data.get('sport')
-            clean_bolt_league = normalize_league(bolt_league) 
-            sport = get_sport_from_league(clean_bolt_league)
-
-            # logger.info(
-            #             "Parsed sport data | bolt_league=%s | clean_bolt_league=%s | sport=%s",
-            #             bolt_league,
-            #             clean_bolt_league,
-            #             sport,
-            #         )
-
-            id = f"{sport}|{inner_data.get('home_team')}|{inner_data.get('away_team')}|{when_utc}"
             american_odds = outcome_data.get("odds")
 
             record = {
@@ -166,29 +176,32 @@ class BoltOddsStreamClient:
 
             with self.lock:
                 key = record.get("id", 0)
-                duplicate_found = False
-
-                for event in self.boltoddsevent:
-                    if key == event.get("id", 0):
-                        duplicate_found = True
-                        break
-                    
-                if not duplicate_found:
-                    self.boltoddsevent.append(record)
+                stored_record = self.boltoddsevent.get(key)
+                if stored_record is not None:
+                    # Duplicate event: refresh the price in place if the line
+                    # moved so the matcher compares against current odds
+                    # instead of whatever we first saw
+                    if stored_record.get("odds_decimal") != record["odds_decimal"]:
+                        stored_record["odds_decimal"] = record["odds_decimal"]
+                        self.updates += 1
+                else:
+                    self.boltoddsevent[key] = record
+                    self.updates += 1
+                    # Evict the oldest entry once the cap is reached
+                    if len(self.boltoddsevent) > self.max_events:
+                        self.boltoddsevent.pop(next(iter(self.boltoddsevent)))
                     # logger.info(f"-----------------Line updated. Added new event: {record}")
-            
+
     def return_all_events(self):
         """Thread-safe method to get all events"""
         with self.lock:
             # logger.info(f'Bolt odds events - {self.boltoddsevent}')
-            return list(self.boltoddsevent)  
-    
+            return list(self.boltoddsevent.values())
+
     def get_event_by_id(self, event_id):
         """Thread-safe method to get specific event"""
         with self.lock:
-            for event in self.boltoddsevent:
-                if event.get("id") == event_id:
-                    return dict(event)  
-            return None
+            event = self.boltoddsevent.get(event_id)
+            return dict(event) if event is not None else None
 
     
\ No newline at end of file
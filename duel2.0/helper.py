@@ -6,8 +6,23 @@ import re
 import logging
 import pytz
 
-logger = logging.getLogger("Helper") 
-logger.setLevel(logging.INFO)          
+logger = logging.getLogger("Helper")
+logger.setLevel(logging.INFO)
+
+# Compiled once at import: these run for every slug/team/league that goes
+# through the matcher, so the patterns must not be re-parsed per call
+_COMPACT_TS_RE = re.compile(r'(\d{4}-\d{2}-\d{2})t(\d{2})(\d{2})(\d{2})z')
+_SLUG_SPECIALS_RE = re.compile(r'[^a-z0-9\s\-|]')
+_NAME_SPECIALS_RE = re.compile(r'[^a-z0-9\s-]')
+_MULTI_SPACE_RE = re.compile(r'\s+')
+_MULTI_HYPHEN_RE = re.compile(r'-+')
+_HYPHEN_BEFORE_PIPE_RE = re.compile(r'-\|')
+_HYPHEN_AFTER_PIPE_RE = re.compile(r'\|-')
+
+# Fixed windows for is_less_than_24_hours_away, built once instead of
+# allocating fresh timedelta objects on every call
+_TD_ZERO = timedelta(0)
+_TD_24H = timedelta(hours=24)
 
 def american_to_decimal(american_odds: str | int | None) -> float | None:
     if american_odds is None:
@@ -43,9 +58,9 @@ def est_to_utc(time_str: str) -> str:
     return dt_utc.strftime("%Y-%m-%dT%H:%M:%SZ")
 
 def calculate_value(slower_odds, sharp_odds):
-    value = (float(slower_odds) - float(sharp_odds))*100/(float(sharp_odds))
-    value = round(value, 2)
-    return value
+    # Convert each operand once; this runs for every matched pair
+    sharp = float(sharp_odds)
+    return round((float(slower_odds) - sharp) * 100.0 / sharp, 2)
 
 def is_less_than_24_hours_away(time_str: str) -> bool:
     if not time_str:
@@ -55,11 +70,7 @@ def is_less_than_24_hours_away(time_str: str) -> bool:
     ts = time_str.lower()
 
     # convert 2026-01-17t200000z → 2026-01-17T20:00:00Z
-    ts = re.sub(
-        r'(\d{4}-\d{2}-\d{2})t(\d{2})(\d{2})(\d{2})z',
-        r'\1T\2:\3:\4Z',
-        ts
-    )
+    ts = _COMPACT_TS_RE.sub(r'\1T\2:\3:\4Z', ts)
 
     try:
         given_time = datetime.strptime(ts, "%Y-%m-%dT%H:%M:%SZ").replace(tzinfo=pytz.UTC)
@@ -69,26 +80,26 @@ def is_less_than_24_hours_away(time_str: str) -> bool:
     current_time = datetime.now(pytz.UTC)
     time_difference = given_time - current_time
 
-    return timedelta(0) < time_difference <= timedelta(hours=24)
+    return _TD_ZERO < time_difference <= _TD_24H
 
 def clean_slug(slug):
     slug = slug.lower()
     
     # Remove special characters, keep only alphanumeric, spaces, and pipes
-    slug = re.sub(r'[^a-z0-9\s\-|]', '', slug)
-    
+    slug = _SLUG_SPECIALS_RE.sub('', slug)
+
     # Replace multiple spaces with single space
-    slug = re.sub(r'\s+', ' ', slug)
-    
+    slug = _MULTI_SPACE_RE.sub(' ', slug)
+
     # Replace spaces with hyphens
     slug = slug.replace(' ', '-')
-    
+
     # Remove multiple consecutive hyphens (but keep pipes intact)
-    slug = re.sub(r'-+', '-', slug)
-    
+    slug = _MULTI_HYPHEN_RE.sub('-', slug)
+
     # Clean up any hyphens adjacent to pipes
-    slug = re.sub(r'-\|', '|', slug)
-    slug = re.sub(r'\|-', '|', slug)
+    slug = _HYPHEN_BEFORE_PIPE_RE.sub('|', slug)
+    slug = _HYPHEN_AFTER_PIPE_RE.sub('|', slug)
     
     return slug.strip('-')
 
@@ -139,10 +150,10 @@ def normalize_league(league, league_map=league_map, threshold=70):
     league_clean = league_clean.replace("international clubs", "") 
 
     # Remove special characters except hyphens and spaces
-    league_clean = re.sub(r'[^a-z0-9\s-]', '', league_clean)
+    league_clean = _NAME_SPECIALS_RE.sub('', league_clean)
 
     # Replace multiple spaces with single space
-    league_clean = re.sub(r'\s+', ' ', league_clean).strip()
+    league_clean = _MULTI_SPACE_RE.sub(' ', league_clean).strip()
 
     # Replace spaces with hyphens **after cleaning**
     league_clean = league_clean.replace(' ', '-')
@@ -171,10 +182,10 @@ def normalize_team(team, team_map=team_map, threshold=70):
     team_clean = team.lower()
 
     # Remove special characters except letters, numbers, and spaces
-    team_clean = re.sub(r'[^a-z0-9\s-]', '', team_clean)
+    team_clean = _NAME_SPECIALS_RE.sub('', team_clean)
 
     # Replace multiple spaces with single space
-    team_clean = re.sub(r'\s+', ' ', team_clean).strip()
+    team_clean = _MULTI_SPACE_RE.sub(' ', team_clean).strip()
 
     # Replace spaces with hyphens
     team_clean = team_clean.replace(' ', '-')
@@ -200,7 +211,7 @@ failed_matches: set[tuple[str, str]] = set()
 def events_match(slug1: str, slug2: str, oddsapi_sport_slug: str, threshold: int = 65) -> tuple[str | None, bool]:
     # skip if we already know this pair failed
     if (slug1, slug2) in failed_matches:
-        logger.info("Skipping already seen failed match set")
+        logger.debug("Skipping already seen failed match set")
         return False
     
     # slug 1 is from odds api, slug 2 is from bolt odds
@@ -274,68 +285,70 @@ def map_market_name(raw_market):
     return market_map.get(raw_market, raw_market)
 
 
+# Built once at import: get_sport_from_league runs per line update, so the
+# dict-of-sets must not be rebuilt on every call
+sport_map = {
+    "hockey": {
+        "nhl",
+        "ncaa-hockey",
+        "national-hockey-league",
+        "national-collegiate-athletic-association-hockey",
+    },
+    "basketball": {
+        "nba",
+        "ncaab",
+        "ncaab-w",
+        "wnba",
+        "ncaa-mens-basketball",
+        "ncaa-womens-basketball",
+        "womens-national-basketball-association",
+        "nba-summer",
+        "nba-preseason",
+        "euroleague",
+        "national-basketball-association",
+    },
+    "baseball": {
+        "mlb",
+        "ncaa-baseball",
+        "major-league-baseball",
+        "national-collegiate-athletic-association-baseball",
+    },
+    "tennis": {
+        "grand-slams",
+        "atp",
+        "wta",
+        "association-of-tennis-professionals",
+        "womens-tennis-association",
+        "atp-wta-tours",
+        "challenger-tournaments",
+        "itf-events",
+    },
+    "football": {
+        "nfl",
+        "ncaa-football",
+        "cfl",
+        "nfl-preseason",
+        "national-collegiate-athletic-association-football",
+        
+    },
+    "soccer": {
+        "mls",
+        "bundesliga",
+        "la-liga",
+        "ligue-1",
+        "serie-a",
+        "epl", "pl", "spain-laliga", "laliga", "germany-bundesliga",
+        "efl championship", "english-football-league-championship", 
+        "primeira-liga",
+        "major-league-soccer", "portugal-liga-portugal"
+        "england-premier-league", "champions-league", 
+        "international-clubs-uefa-champions-league",
+    },
+}
+
 def get_sport_from_league(league: str) -> str | None:
     league = league.strip().lower()
 
-    sport_map = {
-        "hockey": {
-            "nhl",
-            "ncaa-hockey",
-            "national-hockey-league",
-            "national-collegiate-athletic-association-hockey",
-        },
-        "basketball": {
-            "nba",
-            "ncaab",
-            "ncaab-w",
-            "wnba",
-            "ncaa-mens-basketball",
-            "ncaa-womens-basketball",
-            "womens-national-basketball-association",
-            "nba-summer",
-            "nba-preseason",
-            "euroleague",
-            "national-basketball-association",
-        },
-        "baseball": {
-            "mlb",
-            "ncaa-baseball",
-            "major-league-baseball",
-            "national-collegiate-athletic-association-baseball",
-        },
-        "tennis": {
-            "grand-slams",
-            "atp",
-            "wta",
-            "association-of-tennis-professionals",
-            "womens-tennis-association",
-            "atp-wta-tours",
-            "challenger-tournaments",
-            "itf-events",
-        },
-        "football": {
-            "nfl",
-            "ncaa-football",
-            "cfl",
-            "nfl-preseason",
-            "national-collegiate-athletic-association-football",
-            
-        },
-        "soccer": {
-            "mls",
-            "bundesliga",
-            "la-liga",
-            "ligue-1",
-            "serie-a",
-            "epl", "pl", "spain-laliga", "laliga", "germany-bundesliga",
-            "efl championship", "english-football-league-championship", 
-            "primeira-liga",
-            "major-league-soccer", "portugal-liga-portugal"
-            "england-premier-league", "champions-league", 
-            "international-clubs-uefa-champions-league",
-        },
-    }
-
     for sport, leagues in sport_map.items():
         if league in leagues:
             return sport
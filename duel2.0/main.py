@@ -7,9 +7,6 @@ from helper import events_match, calculate_value, map_market_name
 import logging
 load_dotenv()
 
-import logging
-import os
-
 # Create logs directory
 os.makedirs("logs", exist_ok=True)
 
@@ -34,7 +31,10 @@ root_logger.addHandler(app_handler)
 # Main logger
 logger = logging.getLogger("MainLog")
 
-MIN_VALUE = 1.0 
+MIN_VALUE = 1.0
+# Built once at import: compare_odds runs for every matched pair, so the
+# literal must not be rebuilt on every call
+OVER_UNDER_MAP = {"o": "over", "u": "under"}
 class ValueBetFinder:
     def __init__(self):
         logger.info("Initializing ValueBetFinder...")
@@ -116,18 +116,24 @@ class ValueBetFinder:
     def run_matcher(self):
         """Main loop: runs on MAIN thread, matches events and finds valuebets"""
         iteration = 0
-        
+        interval = 2.0  # target seconds between iteration starts
+        max_interval = 60.0  # backoff ceiling on quiet streams
+        consecutive_empty = 0
+        last_updates = (-1, -1)
+
         while True:
             try:
                 iteration += 1
-                
+                started = time.monotonic()
+
                 # Get all events from both sources (thread-safe)
                 oddsapi_events = self.oddsapi_stream.return_all_events()
                 bolt_events = self.bolt_stream.return_all_events()
                 
-                logger.info(f"\n--- Iteration {iteration} ---")
-                logger.info(f"OddsAPI events: {len(oddsapi_events)}")
-                logger.info(f"BoltOdds events: {len(bolt_events)}")
+                # Per-iteration noise: only interesting when debugging the
+                # matcher, and this loop runs every couple of seconds
+                logger.debug("--- Iteration %s --- OddsAPI events: %s, BoltOdds events: %s",
+                             iteration, len(oddsapi_events), len(bolt_events))
                 
             
                 # if oddsapi_events:
@@ -135,48 +141,64 @@ class ValueBetFinder:
                 # if bolt_events:
                 #     logger.info(f"Sample BoltOdds event: {bolt_events[0]}")
                 
-                # Try to match events
-                matches_found = 0
-                
-                for oddsapi_event in oddsapi_events:
-                    oddsapi_event_slug = oddsapi_event.get("id")
-                    oddsapi_sport_slug = oddsapi_event.get("sport")
-                    for bolt_event in bolt_events:
-                        bolt_event_slug = bolt_event.get("id")
+                # Try to match events. Drop events without ids in one pass up
+                # front instead of re-checking inside the O(n*m) matching loop
+                oddsapi_pairs = [(e.get("id"), e.get("sport"), e) for e in oddsapi_events if e.get("id") is not None]
+                bolt_pairs = [(b.get("id"), b) for b in bolt_events if b.get("id") is not None]
 
-                        if oddsapi_event_slug is None or bolt_event_slug is None:
-                            continue
+                matches_found = 0
 
+                for oddsapi_event_slug, oddsapi_sport_slug, oddsapi_event in oddsapi_pairs:
+                    for bolt_event_slug, bolt_event in bolt_pairs:
                         if events_match(oddsapi_event_slug, bolt_event_slug, oddsapi_sport_slug, threshold=70):
                             matches_found += 1
-                            logger.info(f"\nMATCH FOUND!\n"
-                                        f"  OddsAPI pre-normalized ID: {oddsapi_event.get('id')}\n"
-                                        f"  BoltOdds pre-normalized ID: {bolt_event.get('id')}\n"
-                                        f"  Event: {oddsapi_event.get('home_team')} vs {oddsapi_event.get('away_team')}\n"
-                                    )
+                            logger.info("\nMATCH FOUND!\n"
+                                        "  OddsAPI pre-normalized ID: %s\n"
+                                        "  BoltOdds pre-normalized ID: %s\n"
+                                        "  Event: %s vs %s\n",
+                                        oddsapi_event.get('id'), bolt_event.get('id'),
+                                        oddsapi_event.get('home_team'), oddsapi_event.get('away_team'))
 
                             # Compare odds for this matched event
                             self.compare_odds(oddsapi_event, bolt_event)
                 
                 if matches_found > 0:
-                    logger.info(f"\nTotal matches found: {matches_found}")
+                    logger.info("\nTotal matches found: %s", matches_found)
                 else:
-                    logger.info("No matches found this iteration")
-                
-                time.sleep(2)
+                    logger.debug("No matches found this iteration")
+
+                # Back off exponentially only while the stores are static:
+                # the stream threads keep filling them during a long sleep,
+                # so keying on "no matches" alone would detect the first
+                # match of a quiet spell up to a minute late. Any store
+                # mutation (new event or price move) snaps back to the base
+                # interval; only truly idle streams coast up to the cap
+                updates = (self.oddsapi_stream.updates, self.bolt_stream.updates)
+                if updates != last_updates:
+                    last_updates = updates
+                    consecutive_empty = 0
+                else:
+                    consecutive_empty += 1
+                delay = min(interval * (2 ** min(consecutive_empty, 4)), max_interval)
+
+                # Sleep only the remainder of the interval: a slow matching
+                # pass no longer pushes the next one a full 2s further out
+                elapsed = time.monotonic() - started
+                time.sleep(max(0.0, delay - elapsed))
             except Exception as e:
                 logger.error(f"Error in matcher loop: {e}", exc_info=True)
                 time.sleep(5)
     
     def compare_odds(self, oddsapi_event, bolt_event):
         """Compare odds between matched events to find valuebets"""
-        logger.info(f"Crosscheck this - Matching pair found\n"
-                    f"Pre-normalized data\n"
-                    f"----- (Duel) -----\n"
-                    f"{oddsapi_event}\n"
-                    f"----- Pinnacle -----\n"
-                    f"{bolt_event}\n"
-                    f"------------------------------------------")
+        logger.debug("Crosscheck this - Matching pair found\n"
+                     "Pre-normalized data\n"
+                     "----- (Duel) -----\n"
+                     "%s\n"
+                     "----- Pinnacle -----\n"
+                     "%s\n"
+                     "------------------------------------------",
+                     oddsapi_event, bolt_event)
 
         # Get details from oddsappi_event (Duel) & bolt_event (Pinnacle)
         oddsapi_market = oddsapi_event.get('market')
@@ -188,7 +210,7 @@ class ValueBetFinder:
         if oddsapi_price and bolt_price:
             value = calculate_value(oddsapi_price, bolt_price) #value returned in percentage
         if float(value) < MIN_VALUE:
-            logger.info(f"Skipping game. {value} is below minimum value {MIN_VALUE})")
+            logger.debug("Skipping game. %s is below minimum value %s)", value, MIN_VALUE)
             return None
 
         oddsapi_hdp = oddsapi_event.get('hdp') # e.g 0.5
@@ -203,8 +225,7 @@ class ValueBetFinder:
 
         if bolt_over_under is not None:
             # Map "O"/"U" to "over"/"under"
-            over_under_map = {"o": "over", "u": "under"}
-            bolt_selection = over_under_map.get(bolt_over_under.lower())
+            bolt_selection = OVER_UNDER_MAP.get(bolt_over_under.lower())
         elif bolt_target:
             # Map team name to "home", "away", or "draw"
             bolt_target_lower = bolt_target.lower().strip()
@@ -216,17 +237,17 @@ class ValueBetFinder:
             elif bolt_target_lower == bolt_away.lower():
                 bolt_selection = "away"
             else:
-                logger.warning(f"Could not map bolt_target '{bolt_target}' to home/away/draw. "
-                            f"Bolt teams: {bolt_home} vs {bolt_away}")
+                logger.warning("Could not map bolt_target '%s' to home/away/draw. "
+                               "Bolt teams: %s vs %s", bolt_target, bolt_home, bolt_away)
                 return
         else:
-            logger.info("No valid bolt selection found (no over/under or target)")
+            logger.debug("No valid bolt selection found (no over/under or target)")
             return
         
         # Ensure selections match
         if bolt_selection is not None:
             if oddsapi_selection.lower() != bolt_selection.lower():
-                logger.info(f"Selections don't match: {oddsapi_selection} vs {bolt_selection}")
+                logger.debug("Selections don't match: %s vs %s", oddsapi_selection, bolt_selection)
                 return
             
         # Map market names 
@@ -236,15 +257,16 @@ class ValueBetFinder:
         # Only compare if markets match
         if mapped_odds_market and mapped_bolt_market:
             if mapped_odds_market.lower() != mapped_bolt_market.lower():
-                logger.info(f"Markets don't match: {mapped_odds_market} vs {mapped_bolt_market}")
+                logger.debug("Markets don't match: %s vs %s", mapped_odds_market, mapped_bolt_market)
                 return
         
-        logger.info(f"[Value bet pair found\n"
-                    f"----- VALUE BET SIDE (Duel) -----\n"
-                    f"{oddsapi_event}\n"
-                    f"----- CORRESPONDING PINNACLE SIDE -----\n"
-                    f"{bolt_event}\n"
-                    f"------------------------------------------")
+        logger.info("[Value bet pair found\n"
+                    "----- VALUE BET SIDE (Duel) -----\n"
+                    "%s\n"
+                    "----- CORRESPONDING PINNACLE SIDE -----\n"
+                    "%s\n"
+                    "------------------------------------------",
+                    oddsapi_event, bolt_event)
         
 if __name__ == "__main__":
     try:
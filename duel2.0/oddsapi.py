@@ -1,11 +1,11 @@
 import os
-import json
 import logging
 import time
 import threading
-from datetime import datetime, timedelta
+from concurrent.futures import ThreadPoolExecutor
 import websocket
 import requests
+import orjson
 from dotenv import load_dotenv
 from helper import is_less_than_24_hours_away
 
@@ -30,47 +30,72 @@ if not logger.handlers:
 # Let messages also flow to app.log and errors.log
 logger.propagate = True
 
-MIN_VALUE = 1.0 
+MIN_VALUE = 1.0
 MIN_BET_ODDS = 1.2
-MAX_BET_ODDS = 3.0  
+MAX_BET_ODDS = 3.0
+
+# frozenset: membership is tested for every key of every odds entry
+SELECTION_KEYS = frozenset(("home", "away", "draw", "over", "under"))
 
 
 class OddsAPIStreamClient:
     def __init__(self, api_key: str):
         self.api_key = api_key
-        self.bookmakers = ["Duel"]
-        self.markets = ["Spread", "ML", "Totals", "Totals HT", "Asian Handicap", 
-                       "Asian Handicap HT", "Team Total home", "Team Total away", 
+        # frozenset: only ever membership-tested, once per stream message
+        self.bookmakers = frozenset(["Duel"])
+        # frozenset: membership is tested for every market of every message
+        self.markets = frozenset(["Spread", "ML", "Totals", "Totals HT", "Asian Handicap",
+                       "Asian Handicap HT", "Team Total home", "Team Total away",
                        "Team Total home HT", "Team Total away HT", "ML HT", "Spread HT",
-                       "Totals (Games)", "Spread (Games)"]
+                       "Totals (Games)", "Spread (Games)"])
         self.alloddsapievent: list[dict] = []
         self.upcoming_event_ids = []
-        self.oddsapievent: list[dict] = []
+        # Keyed by the composite event id so duplicate detection is O(1);
+        # capped so a multi-day run can't grow memory without bound
+        self.oddsapievent: dict[str, dict] = {}
+        self.max_events = 10_000
+        # Bumped on every store mutation so the matcher can tell whether
+        # anything new arrived since its last pass
+        self.updates = 0
         self.should_reconnect = True
         self.lock = threading.Lock()  
-        self.thread = None 
+        self.thread = None
         self.sports = ['football', 'basketball', 'handball', 'volleyball', 'tennis', 'ice-hockey', 'american-football']
+        # One keep-alive session for the periodic event fetches instead of a
+        # fresh TCP+TLS handshake per sport per refresh
+        self.http = requests.Session()
+
+    def fetch_sport_events(self, sport):
+        """Fetch the event list for a single sport"""
+        url = f"https://api.odds-api.io/v3/events?apiKey={self.api_key}&sport={sport}"
+        response = self.http.get(url, timeout=15)
+        response.raise_for_status()
+        return orjson.loads(response.content)
 
     def get_upcoming_event_ids(self):
         """Fetch all events and return IDs of those in the next 24 hours"""
-        # Fetch all events from all sports
-        for sport in self.sports:
-            url = f"https://api.odds-api.io/v3/events?apiKey={self.api_key}&sport={sport}"
-            response = requests.get(url)
-            response.raise_for_status()
-
-            events = response.json()
-            if isinstance(events, list):
-                self.alloddsapievent.extend(events)
-        # logger.info(self.alloddsapievent)
-        # logger.info("___________________________")
-        
-        # Filter for events in next 24 hours and collect IDs
-        for event in self.alloddsapievent:
-            date_str = event.get("date")
-            # logger.info(event.get("date"))
-            if date_str and is_less_than_24_hours_away(date_str):
-                self.upcoming_event_ids.append(event['id'])
+        # Fetch all sports concurrently instead of one after another, so the
+        # refresh takes as long as the slowest request rather than the sum of
+        # all of them. executor.map propagates the first failure, keeping the
+        # caller's error handling unchanged.
+        all_events = []
+        upcoming_ids = []
+        with ThreadPoolExecutor(max_workers=len(self.sports)) as executor:
+            for events in executor.map(self.fetch_sport_events, self.sports):
+                if not isinstance(events, list):
+                    continue
+                all_events.extend(events)
+                # Filter for events in the next 24 hours in the same pass
+                for event in events:
+                    date_str = event.get("date")
+                    if date_str and is_less_than_24_hours_away(date_str):
+                        upcoming_ids.append(event['id'])
+
+        # Swap in the fresh lists atomically: earlier this extended the old
+        # lists in place, so every 2-hour refresh re-appended the same events
+        # and both lists grew without bound
+        self.alloddsapievent = all_events
+        self.upcoming_event_ids = upcoming_ids
         # logger.info(self.upcoming_event_ids)
 
     def start_periodic_refresh(self, interval_hours=2):
@@ -81,7 +106,7 @@ class OddsAPIStreamClient:
                     self.get_upcoming_event_ids()
                     # logger.info(f"Next refresh in {interval_hours} hours")
                 except Exception as e:
-                    logger.error(f"Error in periodic refresh: {e}", exc_info=True)
+                    logger.error("Error in periodic refresh: %s", e, exc_info=True)
                 
                 # Sleep in smaller intervals to allow graceful shutdown
                 for _ in range(interval_hours * 60):  # Check every minute
@@ -91,7 +116,7 @@ class OddsAPIStreamClient:
         
         self.refresh_thread = threading.Thread(target=refresh_loop, daemon=True)
         self.refresh_thread.start()
-        logger.info(f"Started periodic refresh thread (every {interval_hours} hours)")
+        logger.info("Started periodic refresh thread (every %s hours)", interval_hours)
         
     def build_ws_url(self) -> str:
         return f"wss://api.odds-api.io/v3/ws?apiKey={self.api_key}"
@@ -137,10 +162,11 @@ class OddsAPIStreamClient:
                     continue
 
                 try:
-                    data = json.loads(line)
+                    # orjson parses in C, noticeably faster on the firehose
+                    data = orjson.loads(line)
                     # logger.info(data)
-                except json.JSONDecodeError:
-                    logger.error(f"Failed to parse: {line[:100]}")
+                except orjson.JSONDecodeError:
+                    logger.error("Failed to parse: %s", line[:100])
                     continue
 
                 event_id = data.get("id")
@@ -156,13 +182,13 @@ class OddsAPIStreamClient:
                     return
                 
                 if not event_id:
-                    logger.debug(f"No event_id found in data. Keys present: {list(data.keys())}")
+                    logger.debug("No event_id found in data. Keys present: %s", list(data.keys()))
                     continue
 
                 self.handle_event_message(data)
 
         except Exception as e:
-            logger.error(f"on_message error: {e}", exc_info=True)
+            logger.error("on_message error: %s", e, exc_info=True)
 
     def handle_event_message(self, data):
         event_id = data.get("id")
@@ -173,7 +199,7 @@ class OddsAPIStreamClient:
     )
 
         if not event_data:
-            logger.info(f"Event ID {event_id} not found in alloddsapievent")
+            logger.info("Event ID %s not found in alloddsapievent", event_id)
             return
         
         sport = event_data.get("sport", {}).get("slug")
@@ -181,6 +207,9 @@ class OddsAPIStreamClient:
         home = event_data.get("home")
         away = event_data.get("away")
         date = event_data.get("date")
+        # The composite id only depends on the event, not on the market or
+        # selection, so build it once instead of per odds entry
+        composite_id = f"{sport}|{home}|{away}|{date}".lower()
         # logger.info(event_data)
 
         for market in data.get("markets", []):
@@ -193,18 +222,20 @@ class OddsAPIStreamClient:
                 hdp = entry.get("hdp")
 
                 for key, value in entry.items():
-                    if key not in ("home", "away", "draw", "over", "under"):
+                    if key not in SELECTION_KEYS:
                         continue
 
-                    if float(value) < MIN_BET_ODDS or float(value) > MAX_BET_ODDS:
-                        return 
+                    # Convert once and reuse; this ran three times per entry
+                    odds = float(value)
+                    if not MIN_BET_ODDS <= odds <= MAX_BET_ODDS:
+                        return
 
                     record = {
-                        "id": f"{sport}|{home}|{away}|{date}".lower(),
-                        "sportsbook": "Duel", 
+                        "id": composite_id,
+                        "sportsbook": "Duel",
                         "market": market_name,
-                        "selection": key, 
-                        "odds_decimal": float(value), 
+                        "selection": key,
+                        "odds_decimal": odds,
                         "hdp": hdp,
                         "sport": sport,
                         "league": league,
@@ -218,36 +249,36 @@ class OddsAPIStreamClient:
     def process_bets(self, record):
         with self.lock:
             # Check if event already exists
-            for stored_record in self.oddsapievent:
-                if stored_record.get("id") == record["id"]:
-                    
-                    if stored_record.get("odds_decimal") != record["odds_decimal"]:
-                        stored_record["odds_decimal"] = record["odds_decimal"]
-                    # Duplicate → skip append & log
-                    return    
-
-        # Append new event & log (thread-safe)
-        with self.lock:
-            self.oddsapievent.append(record)
+            stored_record = self.oddsapievent.get(record["id"])
+            if stored_record is not None:
+                if stored_record.get("odds_decimal") != record["odds_decimal"]:
+                    stored_record["odds_decimal"] = record["odds_decimal"]
+                    self.updates += 1
+                # Duplicate → skip append & log
+                return
+
+            # Add new event & log (thread-safe); evict the oldest entry once
+            # the cap is reached (dicts keep insertion order)
+            self.oddsapievent[record["id"]] = record
+            self.updates += 1
+            if len(self.oddsapievent) > self.max_events:
+                self.oddsapievent.pop(next(iter(self.oddsapievent)))
             # logger.info(f"Added new event: {record}")
-            # logger.info(f"Here is self.oddsapievent list {self.oddsapievent}")
 
     def return_all_events(self):
         """Thread-safe method to get all events"""
         with self.lock:
             # logger.info(f'Odds API events - {self.oddsapievent}')
-            return list(self.oddsapievent)  
-    
+            return list(self.oddsapievent.values())
+
     def get_event_by_id(self, event_id):
         """Thread-safe method to get specific event"""
         with self.lock:
-            for event in self.oddsapievent:
-                if event.get("id") == event_id:
-                    return dict(event)  
-            return None
+            event = self.oddsapievent.get(event_id)
+            return dict(event) if event is not None else None
 
     def on_error(self, ws, error):
-        logger.error(f"WebSocket Error: {error}")
+        logger.error("WebSocket Error: %s", error)
 
     def on_close(self, ws, close_status_code, close_msg):
         logger.info("WebSocket closed")
\ No newline at end of file
@@ -3,7 +3,6 @@ import time
 import random
 import logging
 import requests
-import threading
 import asyncio
 import json
 import re
@@ -18,6 +17,38 @@ dotenv.load_dotenv()
 
 logger = logging.getLogger("DuelClient")
 
+# Duel market metadata keyed by market name: market_id (a sport→id dict for ML,
+# where the id varies by sport), the specifier template, and the
+# selection→outcome_id map. One dict lookup replaces the per-bet if/elif chain.
+MARKET_SPECS = {
+    "3-Way Result": {
+        "market_id": "1",
+        "specifier": "",
+        "selections": {"home": "1", "draw": "2", "away": "3"}
+    },
+    "ML": {
+        "market_id": {"ice hockey": "406", "soccer": "406", "volleyball": "186", "tennis": "186"},
+        "default_market_id": "219",
+        "specifier": "",
+        "selections": {"home": "4", "away": "5"}
+    },
+    "Spread": {
+        "market_id": "16",
+        "specifier": "hcp={hdp}",
+        "selections": {"home": "1714", "away": "1715"}
+    },
+    "Totals": {
+        "market_id": "18",
+        "specifier": "total={hdp}",
+        "selections": {"over": "12", "under": "13"}
+    },
+    "Totals HT": {
+        "market_id": "68",
+        "specifier": "total={hdp}",
+        "selections": {"over": "12", "under": "13"}
+    },
+}
+
 
 class DuelClient:
     """
@@ -45,18 +76,44 @@ class DuelClient:
         self.auth_token: Optional[str] = None
         self.base_url = "https://duel.com"
         self.api_base_url = "https://api-a-c7818b61-600.sptpub.com"
-        self.token_refresh_timer: Optional[threading.Timer] = None
+        self._token_refresh_task: Optional[asyncio.Task] = None
         self.token_refresh_interval = 15 * 60  # 15 minutes in seconds
-        self._token_refresh_lock = threading.Lock()
         self._is_running = True
         self.balance = 0
         self.target_button_selectors = [
                 '#bt-root > div > div > div:nth-child(2) > div:nth-child(1) > div > div > div > div > div > div > div:nth-child(1)',
                 '#bt-root > div > div > div:nth-child(2) > div:nth-child(1) > div > div > div > div > div > div > div:nth-child(2)'
             ]
-        self._token_refresh_event = threading.Event()  # Event to signal main thread to refresh token
         self._loop: Optional[asyncio.AbstractEventLoop] = None  # Event loop for async operations
-        
+        # Keep-alive session for the bet API: placing a bet and reading the
+        # settled odds reuse one warm TLS connection instead of a fresh
+        # handshake on the most latency-sensitive calls the bot makes
+        self.http = requests.Session()
+        # Static pieces of the bet API requests, built once; per-call code
+        # copies the headers and fills in the current auth token
+        self._bet_place_url = f"{self.api_base_url}/api/v2/coupon/brand/2482975601191952386/bet/place"
+        self._bet_list_url = f"{self.api_base_url}/api/v1/my_bets/list"
+        self._bet_list_params = {
+            "currency": "USD",
+            "lang": "en",
+            "limit": "15",
+            "skip": "0",
+            "status": "",
+            "timestamp_from": "",
+            "timestamp_to": ""
+        }
+        self._api_headers = {
+            "accept": "*/*",
+            "accept-language": "en-US,en;q=0.9",
+            "content-type": "application/json",
+            "origin": "https://duel.com",
+            "referer": "https://duel.com/",
+            "sec-fetch-dest": "empty",
+            "sec-fetch-mode": "cors",
+            "sec-fetch-site": "same-origin",
+            "user-agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64; rv:121.0) Gecko/20100101 Firefox/121.0"
+        }
+
         # Account information
         self.selected_account: Optional[Dict[str, str]] = None
         self.proxy_config: Optional[Dict[str, str]] = None
@@ -90,7 +147,7 @@ class DuelClient:
                     # Split by comma - first 3 parts are account info, 4th part is proxy info
                     parts = line.split(',')
                     if len(parts) != 4:
-                        logger.warning(f"Invalid format on line {line_num} (expected 4 comma-separated parts): {line}")
+                        logger.warning("Invalid format on line %s (expected 4 comma-separated parts): %s", line_num, line)
                         continue
                     
                     account_name = parts[0].strip()
@@ -101,7 +158,7 @@ class DuelClient:
                     # Parse proxy information (format: host:port:user:pass)
                     proxy_parts = proxy_info.split(':')
                     if len(proxy_parts) != 4:
-                        logger.warning(f"Invalid proxy format on line {line_num} (expected host:port:user:pass): {proxy_info}")
+                        logger.warning("Invalid proxy format on line %s (expected host:port:user:pass): %s", line_num, proxy_info)
                         continue
                     
                     proxy_host, proxy_port, proxy_user, proxy_pass = proxy_parts
@@ -115,11 +172,11 @@ class DuelClient:
                         'proxy_pass': proxy_pass
                     }
             
-            logger.info(f"Loaded {len(accounts)} accounts from {accounts_file}")
+            logger.info("Loaded %s accounts from %s", len(accounts), accounts_file)
             return accounts
             
         except Exception as e:
-            logger.error(f"Error reading accounts file: {e}", exc_info=True)
+            logger.error("Error reading accounts file: %s", e, exc_info=True)
             raise
     
     @staticmethod
@@ -203,7 +260,7 @@ class DuelClient:
             await page.add_init_script(anti_detection_script)
             logger.debug("Firefox anti-detection script injected")
         except Exception as e:
-            logger.warning(f"Failed to inject anti-detection script: {e}")
+            logger.warning("Failed to inject anti-detection script: %s", e)
     
     async def start(self):
         """Start the Playwright Firefox browser instance with proxy and normal context."""
@@ -225,7 +282,7 @@ class DuelClient:
                 "password": proxy_pass
             }
             
-            logger.info(f"Starting Playwright Firefox browser with proxy: {proxy_host}:{proxy_port}")
+            logger.info("Starting Playwright Firefox browser with proxy: %s:%s", proxy_host, proxy_port)
             print(f"Using proxy: {proxy_host}:{proxy_port}")
             
             self.playwright = await async_playwright().start()
@@ -269,7 +326,7 @@ class DuelClient:
             logger.info("Firefox browser started successfully with proxy and anti-detection")
             
         except Exception as e:
-            logger.error(f"Error starting Firefox browser: {e}", exc_info=True)
+            logger.error("Error starting Firefox browser: %s", e, exc_info=True)
             raise
     
     async def verify_proxy(self) -> bool:
@@ -301,7 +358,7 @@ class DuelClient:
             
             for url in ip_check_urls:
                 try:
-                    logger.info(f"Checking IP via {url}...")
+                    logger.info("Checking IP via %s...", url)
                     await self.page.goto(url, wait_until="networkidle", timeout=10000)
                     await asyncio.sleep(1)  # Wait for page to fully load
                     
@@ -323,14 +380,14 @@ class DuelClient:
                             ip_address = data['query']
                         
                         if ip_address:
-                            logger.info(f"Successfully retrieved IP: {ip_address}")
+                            logger.info("Successfully retrieved IP: %s", ip_address)
                             break
                     except (json.JSONDecodeError, Exception) as e:
-                        logger.debug(f"Could not parse JSON from {url}: {e}")
+                        logger.debug("Could not parse JSON from %s: %s", url, e)
                         continue
                         
                 except Exception as e:
-                    logger.warning(f"Failed to check IP via {url}: {e}")
+                    logger.warning("Failed to check IP via %s: %s", url, e)
                     continue
             
             # If JSON parsing failed, try to get IP from page text
@@ -343,7 +400,7 @@ class DuelClient:
                     if ip_text and self._is_valid_ip(ip_text):
                         ip_address = ip_text.strip()
                 except Exception as e:
-                    logger.warning(f"Failed to get IP from icanhazip.com: {e}")
+                    logger.warning("Failed to get IP from icanhazip.com: %s", e)
             
             if ip_address:
                 # Display proxy information
@@ -352,7 +409,7 @@ class DuelClient:
                 print(f"  Your IP Address: {ip_address}")
                 print(f"  Proxy Username: {self.proxy_config['username']}")
                 print("=" * 60)
-                logger.info(f"Proxy verified - IP Address: {ip_address}")
+                logger.info("Proxy verified - IP Address: %s", ip_address)
                 return True
             else:
                 print("\n✗ Failed to verify proxy - Could not retrieve IP address")
@@ -361,7 +418,7 @@ class DuelClient:
                 return False
                 
         except Exception as e:
-            logger.error(f"Error verifying proxy: {e}", exc_info=True)
+            logger.error("Error verifying proxy: %s", e, exc_info=True)
             print(f"\n✗ Error verifying proxy: {e}")
             print("=" * 60)
             return False
@@ -391,11 +448,11 @@ class DuelClient:
     async def stop(self):
         """Stop the Playwright browser instance."""
         try:
-            # Stop token refresh timer
+            # Stop token refresh task
             self._is_running = False
-            if self.token_refresh_timer:
-                self.token_refresh_timer.cancel()
-                self.token_refresh_timer = None
+            if self._token_refresh_task:
+                self._token_refresh_task.cancel()
+                self._token_refresh_task = None
             
             # Close context and browser
             if self.context:
@@ -406,90 +463,43 @@ class DuelClient:
                 await self.playwright.stop()
             logger.info("Browser stopped successfully")
         except Exception as e:
-            logger.error(f"Error stopping browser: {e}", exc_info=True)
-    
-    def _refresh_token_periodically(self):
-        """
-        Internal method to signal token refresh every 30 minutes.
-        This is called by a timer thread and sets an event to signal the main thread.
-        The actual Playwright operations must happen in the main thread.
-        """
-        if not self._is_running:
-            return
-        
-        try:
-            logger.info("Token refresh timer triggered - signaling main thread to refresh token...")
-            # Signal the main thread to perform the refresh
-            self._token_refresh_event.set()
-            
-            # Schedule next refresh
-            if self._is_running:
-                self.token_refresh_timer = threading.Timer(
-                    self.token_refresh_interval,
-                    self._refresh_token_periodically
-                )
-                self.token_refresh_timer.daemon = True
-                self.token_refresh_timer.start()
-                
-        except Exception as e:
-            logger.error(f"Error in token refresh timer: {e}", exc_info=True)
-            # Schedule next refresh even if this one failed
-            if self._is_running:
-                self.token_refresh_timer = threading.Timer(
-                    self.token_refresh_interval,
-                    self._refresh_token_periodically
-                )
-                self.token_refresh_timer.daemon = True
-                self.token_refresh_timer.start()
+            logger.error("Error stopping browser: %s", e, exc_info=True)
     
-    async def refresh_token_if_needed(self) -> bool:
+    async def _token_refresh_loop(self):
         """
-        Check if token refresh is needed and perform it if so.
-        This method must be called from the async event loop.
-        
-        Returns:
-            True if token was refreshed, False otherwise
+        Refresh the authorization token every 15 minutes.
+
+        Runs as an asyncio task on the client's event loop, so the Playwright
+        calls happen directly on the right loop instead of a timer thread
+        signalling the main thread and the main loop polling every second.
         """
-        if not self._token_refresh_event.is_set():
-            return False
-        
-        # Clear the event
-        self._token_refresh_event.clear()
-        
-        try:
-            logger.info("Refreshing authorization token (triggered by timer)...")
-            
-            # Perform the actual token refresh
-            token = await self.extract_auth_token_from_request(request_url_pattern='my_bets/list')
-            
-            with self._token_refresh_lock:
+        while self._is_running:
+            await asyncio.sleep(self.token_refresh_interval)
+            if not self._is_running:
+                return
+            try:
+                logger.info("Refreshing authorization token...")
+                token = await self.extract_auth_token_from_request(request_url_pattern='my_bets/list')
                 if token:
                     self.auth_token = token
                     logger.info("Authorization token refreshed successfully")
-                    return True
                 else:
                     logger.warning("Failed to refresh authorization token, keeping existing token")
-                    return False
-                    
-        except Exception as e:
-            logger.error(f"Error refreshing token: {e}", exc_info=True)
-            return False
-    
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error("Error refreshing token: %s", e, exc_info=True)
+
     def start_token_refresh(self):
         """
-        Start the periodic token refresh mechanism.
-        Token will be refreshed every 30 minutes.
+        Start the periodic token refresh task.
+        Token will be refreshed every 15 minutes.
         """
         if not self._is_running:
             return
         
-        logger.info(f"Starting token refresh mechanism (every {self.token_refresh_interval // 60} minutes)")
-        self.token_refresh_timer = threading.Timer(
-            self.token_refresh_interval,
-            self._refresh_token_periodically
-        )
-        self.token_refresh_timer.daemon = True
-        self.token_refresh_timer.start()
+        logger.info("Starting token refresh task (every %s minutes)", self.token_refresh_interval // 60)
+        self._token_refresh_task = asyncio.get_running_loop().create_task(self._token_refresh_loop())
     
     async def is_logged_in(self) -> bool:
         """
@@ -541,7 +551,7 @@ class DuelClient:
             return False
             
         except Exception as e:
-            logger.error(f"Error checking login status: {e}", exc_info=True)
+            logger.error("Error checking login status: %s", e, exc_info=True)
             return False
     
     async def login(self, username: Optional[str] = None, password: Optional[str] = None):
@@ -668,7 +678,7 @@ class DuelClient:
                 raise RuntimeError("Login failed - still not logged in after attempt")
                 
         except Exception as e:
-            logger.error(f"Error during login: {e}", exc_info=True)
+            logger.error("Error during login: %s", e, exc_info=True)
             raise
     
     async def navigate_to_my_bets(self):
@@ -711,7 +721,7 @@ class DuelClient:
             logger.info("Successfully navigated to My Bets page")
             
         except Exception as e:
-            logger.error(f"Error navigating to My Bets: {e}", exc_info=True)
+            logger.error("Error navigating to My Bets: %s", e, exc_info=True)
             raise
     
     async def extract_auth_token_from_request(self, request_url_pattern: str = 'my_bets/list') -> Optional[str]:
@@ -748,12 +758,12 @@ class DuelClient:
                     if request_url_pattern:
                         if request_url_pattern in url:
                             captured_token = token
-                            logger.info(f"Captured auth token from matching endpoint: {url}")
-                            logger.info(f"Captured auth token: {token}")
+                            logger.info("Captured auth token from matching endpoint: %s", url)
+                            logger.info("Captured auth token: %s", token)
                     # elif 'api' in url.lower() and not captured_token:
                     #     # Capture any API token as fallback
                     #     captured_token = token
-                    #     logger.info(f"Captured auth token from API endpoint: {url}")
+                    #     logger.info("Captured auth token from API endpoint: %s", url)
             
             # Set up request listener BEFORE navigating
             self.page.on("request", handle_request)
@@ -787,20 +797,20 @@ class DuelClient:
                                 await button.click(timeout=5000)
                                 buttons_clicked += 1
                                 button_clicked = True
-                                logger.info(f"Clicked filter button {buttons_clicked} with selector: {selector}")
+                                logger.info("Clicked filter button %s with selector: %s", buttons_clicked, selector)
                                 
                                 await asyncio.sleep(1.5)  # Wait for API request to complete
                             except Exception as e:
-                                logger.debug(f"Could not click button {i}: {e}")
+                                logger.debug("Could not click button %s: %s", i, e)
                                 continue
                         if button_clicked:
                             break
                 except Exception as e:
-                    logger.error(f"Could not find buttons with selector {selector}: {e}")
+                    logger.error("Could not find buttons with selector %s: %s", selector, e)
                     continue
 
             self.target_button_selectors.reverse()
-            logger.info(f"Reversed button selectors: {self.target_button_selectors}")
+            logger.info("Reversed button selectors: %s", self.target_button_selectors)
 
             
             # Wait a bit more for any pending requests to complete
@@ -812,7 +822,7 @@ class DuelClient:
             except:
                 pass
             
-            logger.info(f"Processed {request_count} requests during token extraction")
+            logger.info("Processed %s requests during token extraction", request_count)
             
             if captured_token:
                 self.auth_token = captured_token
@@ -824,7 +834,7 @@ class DuelClient:
                 return None
                 
         except Exception as e:
-            logger.error(f"Error extracting auth token: {e}", exc_info=True)
+            logger.error("Error extracting auth token: %s", e, exc_info=True)
             return None
     
     def get_auth_token(self, force_refresh: bool = False) -> Optional[str]:
@@ -880,14 +890,14 @@ class DuelClient:
             try:
                 # Convert to float
                 self.balance = float(cleaned_balance)
-                logger.info(f"Balance updated: ${self.balance:.2f}")
+                logger.info("Balance updated: $%.2f", self.balance)
                 return True
             except ValueError as e:
-                logger.error(f"Failed to convert balance to float: {cleaned_balance}, error: {e}")
+                logger.error("Failed to convert balance to float: %s, error: %s", cleaned_balance, e)
                 return False
                 
         except Exception as e:
-            logger.error(f"Error updating balance: {e}", exc_info=True)
+            logger.error("Error updating balance: %s", e, exc_info=True)
             return False
     
     async def place_bet(
@@ -925,60 +935,21 @@ class DuelClient:
         if self.balance <= 0:
             raise RuntimeError(f"Invalid balance: ${self.balance}. Cannot place bet.")
         
-        url = f"{self.api_base_url}/api/v2/coupon/brand/2482975601191952386/bet/place"
-        
-        # Map market and selection to IDs
-        market_id = ''
-        selection_id = ''
-        specifier = ''
-        
-        logger.info(f"Placing bet for event_id: {duel_event_id}, market_name: {market_name}, selection: {selection}, hdp: {hdp}, odds: {odds}, balance: ${self.balance:.2f}")
-        
-        if market_name == "3-Way Result":
-            market_id = "1"
-            if selection == "home":
-                selection_id = "1"
-            elif selection == "away":
-                selection_id = "3"
-            elif selection == "draw":
-                selection_id = "2"
+        url = self._bet_place_url
 
-        elif market_name == "ML":
-            if sport.lower() in ['ice hockey', 'soccer']:
-                market_id = "406"
-            elif sport.lower() in ["volleyball", "tennis"]:
-                market_id = "186"
-            else:
-                market_id = "219"
+        logger.info("Placing bet for event_id: %s, market_name: %s, selection: %s, hdp: %s, odds: %s, balance: $%.2f", duel_event_id, market_name, selection, hdp, odds, self.balance)
 
-            if selection == "home":
-                selection_id = "4"
-            elif selection == "away":
-                selection_id = "5"
-            
-        elif market_name == "Spread":
-            market_id = "16"
-            specifier = f"hcp={hdp}"
-            if selection == "home":
-                selection_id = "1714"
-            elif selection == "away":
-                selection_id = "1715"
-        elif market_name == "Totals":
-            market_id = "18"
-            specifier = f'total={hdp}'
-            if selection == "over":
-                selection_id = "12"
-            elif selection == "under":
-                selection_id = "13"
-        elif market_name == "Totals HT":
-            market_id = '68'
-            specifier = f'total={hdp}'
-            if selection == "over":
-                selection_id = "12"
-            elif selection == "under":
-                selection_id = "13"
-        else:
+        # Map market and selection to IDs via the precomputed table
+        spec = MARKET_SPECS.get(market_name)
+        if spec is None:
             raise ValueError(f"Unsupported market: {market_name}")
+
+        market_id = spec["market_id"]
+        if isinstance(market_id, dict):
+            market_id = market_id.get(sport.lower(), spec["default_market_id"])
+
+        selection_id = spec["selections"].get(selection, '')
+        specifier = spec["specifier"].format(hdp=hdp) if spec["specifier"] else ''
         
         bet_request_id = f"{duel_event_id}-{market_id}-{specifier}-{selection_id}"
         
@@ -989,7 +960,7 @@ class DuelClient:
         if stake <= 0:
             raise RuntimeError(f"Calculated stake is invalid: ${stake}. Balance may be too low.")
         
-        logger.info(f"Calculated stake: ${stake:.2f} (1.5% of ${self.balance:.2f})")
+        logger.info("Calculated stake: $%.2f (1.5%% of $%.2f)", stake, self.balance)
         
         payload = [
             {
@@ -1026,32 +997,22 @@ class DuelClient:
             }
         ]
         
-        logger.info(f"Bet payload: {payload}")
-        
-        headers = {
-            "accept": "*/*",
-            "accept-language": "en-US,en;q=0.9",
-            "authorization": token,
-            "content-type": "application/json",
-            "origin": "https://duel.com",
-            "referer": "https://duel.com/",
-            "sec-fetch-dest": "empty",
-            "sec-fetch-mode": "cors",
-            "sec-fetch-site": "same-origin",
-            "user-agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64; rv:121.0) Gecko/20100101 Firefox/121.0"
-        }
-        
+        logger.info("Bet payload: %s", payload)
+
+        headers = dict(self._api_headers)
+        headers["authorization"] = token
+
         try:
-            response = requests.post(url, json=payload, headers=headers, timeout=10)
+            response = self.http.post(url, json=payload, headers=headers, timeout=10)
             response.raise_for_status()
             result = response.json()
-            logger.info(f"Bet Response: {result}")
+            logger.info("Bet Response: %s", result)
             print(f"Bet Response: {result}")
             return result
         except requests.RequestException as e:
-            logger.error(f"Error placing bet: {e}")
+            logger.error("Error placing bet: %s", e)
             if hasattr(e, 'response') and e.response is not None:
-                logger.error(f"Response: {e.response.text}")
+                logger.error("Response: %s", e.response.text)
             raise
     
     def place_bet_sync(
@@ -1102,33 +1063,14 @@ class DuelClient:
         if not token:
             raise RuntimeError("No authorization token available. Please login first.")
         
-        url = f"{self.api_base_url}/api/v1/my_bets/list"
-        
-        querystring = {
-            "currency": "USD",
-            "lang": "en",
-            "limit": "15",
-            "skip": "0",
-            "status": "",
-            "timestamp_from": "",
-            "timestamp_to": ""
-        }
-        
-        headers = {
-            "accept": "*/*",
-            "accept-language": "en-US,en;q=0.9",
-            "authorization": token,
-            "content-type": "application/json",
-            "origin": "https://duel.com",
-            "referer": "https://duel.com/",
-            "sec-fetch-dest": "empty",
-            "sec-fetch-mode": "cors",
-            "sec-fetch-site": "same-origin",
-            "user-agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64; rv:121.0) Gecko/20100101 Firefox/121.0"
-        }
-        
+        url = self._bet_list_url
+        querystring = self._bet_list_params
+
+        headers = dict(self._api_headers)
+        headers["authorization"] = token
+
         try:
-            response = requests.get(url, headers=headers, params=querystring, timeout=10)
+            response = self.http.get(url, headers=headers, params=querystring, timeout=10)
             response.raise_for_status()
             bet_list = response.json().get('results', [])
             
@@ -1139,7 +1081,7 @@ class DuelClient:
             
             return None, self.balance
         except requests.RequestException as e:
-            logger.error(f"Error getting bet odds: {e}")
+            logger.error("Error getting bet odds: %s", e)
             return None, self.balance
     
     async def initialize(self):
@@ -1201,6 +1143,6 @@ class DuelClient:
                 return False
                 
         except Exception as e:
-            logger.error(f"Error initializing DuelClient: {e}", exc_info=True)
+            logger.error("Error initializing DuelClient: %s", e, exc_info=True)
             raise
 
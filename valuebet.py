@@ -1,30 +1,33 @@
 import os
-import json
+import functools
 import logging
 import time
 import asyncio
 from datetime import datetime, timedelta
-from attr import dataclass
+from collections import OrderedDict, deque
 import websocket
 import requests
+import orjson
 import pytz
+try:
+    import ciso8601
+except ImportError:  # optional C parser; strptime fallback below
+    ciso8601 = None
 import pygsheets
 import dotenv
 import signal
+import queue
 from typing import Optional, Dict, Any
 import sys
-import random
-import winsound
+try:
+    import winsound
+except ImportError:  # not on Windows: notification sounds become no-ops
+    winsound = None
 import threading
 from duel_client import DuelClient
 dotenv.load_dotenv()
 
-logging.basicConfig(
-    level=logging.INFO,
-    format="%(asctime)s [%(levelname)s] %(name)s: %(message)s",
-    datefmt="%Y-%m-%d %H:%M:%S",
-    filename="OddsFinder.log")      
-logger = logging.getLogger("OddsFinder")  
+logger = logging.getLogger("OddsFinder")
 
 
 def resource_path(relative_path):
@@ -37,44 +40,149 @@ def resource_path(relative_path):
 
     return os.path.join(base_path, relative_path)
 
+@functools.lru_cache(maxsize=None)
+def _resolved_sound_path(sound_path):
+    """resource_path result cached per file; it never changes at runtime"""
+    return resource_path(sound_path)
+
+
+# Playback runs on its own daemon thread so a blocking play can never stall
+# the odds worker; play_notification_sound just enqueues the request
+_sound_queue = queue.Queue()
+
+
+def _sound_worker():
+    while True:
+        path, flags = _sound_queue.get()
+        try:
+            winsound.PlaySound(path, flags)
+        except RuntimeError as exc:
+            logger.error("Failed to play notification sound (%s): %s", path, exc)
+
+
+if winsound is not None:
+    threading.Thread(target=_sound_worker, daemon=True).start()
+
+
 def play_notification_sound(sound_path: str = "alarm.wav", async_play: bool = True) -> None:
     """
     Play a .wav file using the built-in Windows sound API.
 
+    Playback is handed to a dedicated thread, so this always returns
+    immediately; no-op on platforms without winsound.
+
     Args:
         sound_path: Relative or absolute path to the .wav file.
-        async_play: True → return immediately; False → block until playback finishes.
+        async_play: True → fire-and-forget playback; False → let the clip play out.
     """
     # if not os.path.exists(sound_path):
     #     logger.error("Notification sound not found: %s", sound_path)
     #     return
 
+    if winsound is None:
+        return
+
     flags = winsound.SND_FILENAME
     if async_play:
         flags |= winsound.SND_ASYNC
 
-    try:
-        winsound.PlaySound(resource_path(sound_path), flags)
-    except RuntimeError as exc:
-        logger.error("Failed to play notification sound (%s): %s", sound_path, exc)
+    _sound_queue.put((_resolved_sound_path(sound_path), flags))
+
+
+# Selection keys we care about inside an odds entry; frozenset membership is a
+# single hash probe instead of a linear tuple scan on every key of every entry
+VALID_SELECTIONS = frozenset({"home", "away", "draw", "over", "under", "yes", "no"})
+
+# Bound once; pytz.UTC is attribute-looked-up on every timestamp otherwise
+_UTC = pytz.UTC
+
+# Fixed windows used by the time filters below, built once instead of
+# allocating fresh timedelta objects on every call in the hot filter path
+_TD_ZERO = timedelta(0)
+_TD_2M = timedelta(minutes=2)
+_TD_45M = timedelta(minutes=45)
+_TD_48H = timedelta(hours=48)
+# Cache for the variable windows passed to is_within_one_minute; only a
+# handful of values (2, 10, 360) ever occur
+_TD_MINUTES: dict[int, timedelta] = {}
+
+# Sports we bet on until 2 minutes before kickoff; tennis alone uses a
+# 45-minute cutoff (see should_process_event)
+_SHORT_LEAD_SPORTS = frozenset({"football", "basketball", "baseball", "american football",
+                                "ice hockey", "esports", "handball", "rugby", "volleyball",
+                                "badminton", "beach soccer", "beach volleyball", "table tennis"})
+
+# Shared HTTP session so repeated API calls reuse one keep-alive connection
+# instead of paying a TCP+TLS handshake each time; the adapter keeps a small
+# pool of persistent connections for bursts of concurrent lookups
+http_session = requests.Session()
+_http_adapter = requests.adapters.HTTPAdapter(pool_connections=8, pool_maxsize=32)
+http_session.mount("https://", _http_adapter)
+http_session.mount("http://", _http_adapter)
 
 
 class OddsFinder:
-    def __init__(self, api_key: str, input_data: dict, worksheet, sent_bets: list = None, duel_client: Optional[DuelClient] = None):
+    def __init__(self, api_key: str, input_data: dict, worksheet, sent_bets=None, duel_client: Optional[DuelClient] = None):
         self.api_key = api_key
+        # Reused for every event-details request; the key never changes
+        self._event_params = {"apiKey": api_key}
         self.input_data = input_data
+        # Bet limits read for every odds entry on the stream; pull them out
+        # of input_data once instead of two dict lookups per entry
+        self._min_odd = float(input_data['min_prematch_odd'])
+        self._max_odd = float(input_data['max_prematch_odd'])
+        self._min_value = float(input_data['min_value_percentage'])
         self.worksheet = worksheet
         self.duel_client = duel_client
-        self.bookmakers = ["Duel", "Pinnacle"]
-        self.markets = ["Spread", "ML", "Totals", "Totals HT", "3-Way Result",
-                       "Asian Handicap HT", "Team Total Home", "Team Total Away", 
+        # frozenset: only ever membership-tested, once per stream message
+        self.bookmakers = frozenset(["Duel", "Pinnacle"])
+        # frozenset: membership is tested for every market of every message
+        self.markets = frozenset(["Spread", "ML", "Totals", "Totals HT", "3-Way Result",
+                       "Asian Handicap HT", "Team Total Home", "Team Total Away",
                        "Team Total Home HT", "Team Total Away HT", "ML HT", "Spread HT",
-                       "Totals (Games)", "Spread (Games)", "Totals 1st Set (Games)", "Spread 1st Set (Games)", "ML 1st Set"]
-        self.odds_store = []
-        self.value_events = sent_bets or []
+                       "Totals (Games)", "Spread (Games)", "Totals 1st Set (Games)", "Spread 1st Set (Games)", "ML 1st Set"])
+        # Underscored market names used in uids, computed once instead of
+        # calling str.replace for every odds entry
+        self._mkt_slug = {m: m.replace(' ', '_') for m in self.markets}
+        # LRU of odds records keyed by (uid, bookie); bounded so a multi-day run
+        # can't grow memory (and per-message work) without limit
+        self.odds_store = OrderedDict()
+        self.max_odds_store = 50_000
+        # Time-based expiry on top of the LRU cap: each insert queues
+        # (deadline, key) and _evict_expired drops records that haven't been
+        # touched within the TTL, so stale prices can't pair with fresh ones.
+        # Must cover the 360-minute Duel freshness window below: a static
+        # Duel line is considered bettable for 6 hours, and re-sent-but-
+        # unchanged markets are skipped before they can refresh _touched,
+        # so a shorter TTL would evict lines the bot still wants to pair
+        self.odds_ttl = 6 * 3600  # seconds
+        self._expiry_queue = deque()
+        # Event metadata (sport/league/teams/start time) is immutable for the
+        # lifetime of an event; cache it so repeat value checks on the same
+        # event don't re-hit the events API
+        self._event_meta_cache = {}
+        self._event_meta_ttl = 3600  # seconds
+        # set: membership is checked for every record and every bet here must
+        # only ever be placed once
+        self.value_events = set(sent_bets or [])
         self.is_running = True
         self.ws = None
         self.backoff = 1  # Track backoff for reset on successful connection
+        # Raw messages are handed off to a worker thread so slow processing
+        # (odds pairing, API calls, bet placement) can't back up the socket's
+        # recv loop; bounded so a stall sheds load instead of growing memory
+        self.message_queue = queue.Queue(maxsize=1000)
+        self.max_batch_size = 256
+        self._worker_thread = None
+        # Sheet rows are buffered and written in batches so a burst of value
+        # bets doesn't turn into one Sheets API round-trip per alert
+        self._alert_buffer = []
+        self._last_flush = time.monotonic()
+        # Last seen updatedAt per (event, bookie, market): the feed often
+        # re-sends whole events where most markets are unchanged, and those
+        # can be skipped without touching their odds entries
+        self._last_market_update = {}
+        self.max_market_updates = 50_000
 
     def on_open(self, ws):
         logger.info("WebSocket connected successfully")
@@ -83,31 +191,87 @@ class OddsFinder:
         self.backoff = 1
 
     def on_message(self, ws, message):
+        # Keep the socket callback tiny: just enqueue for the worker thread
         try:
-            # logger.info(f"Raw message received: {message[:25]}")
-            lines = message.strip().split('\n')
-            # logger.info(f"Split into {len(lines)} lines")
-            for line in lines:
-                if not line.strip():
-                    continue
+            self.message_queue.put_nowait(message)
+        except queue.Full:
+            logger.warning("Message queue full, dropping message")
 
+    def _process_messages(self):
+        """Worker loop: drains the message queue and does the real work"""
+        while self.is_running:
+            try:
+                message = self.message_queue.get(timeout=1)
+            except queue.Empty:
+                self._flush_alerts_if_stale()
+                continue
+            # Drain whatever else has already arrived (bounded) so a burst is
+            # handled as one batch instead of in lockstep with arrival
+            batch = [message]
+            while len(batch) < self.max_batch_size:
                 try:
-                    data = json.loads(line)
-                    # logger.info(f"Parsed JSON: {data}")  
+                    batch.append(self.message_queue.get_nowait())
+                except queue.Empty:
+                    break
+            self._handle_batch(batch)
+
+    def _flush_alerts_if_stale(self):
+        """Flush the alert buffer once it has aged past the 30s window.
+
+        Called from both the idle tick and the per-batch path: a buffered
+        sheet row is the cross-restart dedup record for a bet already placed
+        with real money, so it must reach the sheet within the window whether
+        the feed is quiet or firehosing — losing it means a restarted bot
+        could re-place the same bet.
+        """
+        if self._alert_buffer and time.monotonic() - self._last_flush > 30:
+            try:
+                self._flush_alerts()
+            except Exception as e:
+                logger.error("Error flushing alert buffer: %s", e, exc_info=True)
 
-                except json.JSONDecodeError:
-                    logger.error(f"Failed to parse: {line[:100]}")
-                    continue
+    def _handle_batch(self, batch):
+        self._flush_alerts_if_stale()
+        try:
+            self._evict_expired()
+            # Parse everything first and coalesce at market granularity:
+            # when a burst carries several updates for the same event and
+            # bookie, the newest message wins per market, but markets only
+            # present in older messages are kept — messages are not full
+            # snapshots, so dropping whole older messages would lose them
+            latest = {}
+            for message in batch:
+                for line in message.strip().split('\n'):
+                    if not line.strip():
+                        continue
 
-                event_id = data.get("id")
-                if not event_id:
-                    logger.debug(f"No event_id found in data. Keys present: {list(data.keys())}")
-                    continue
+                    try:
+                        data = orjson.loads(line)
+                        # logger.info(f"Parsed JSON: {data}")
+
+                    except orjson.JSONDecodeError:
+                        logger.error("Failed to parse: %s", line[:100])
+                        continue
+
+                    event_id = data.get("id")
+                    if not event_id:
+                        logger.debug("No event_id found in data. Keys present: %s", list(data.keys()))
+                        continue
 
+                    key = (event_id, data.get("bookie"))
+                    prev = latest.get(key)
+                    if prev is not None:
+                        merged = {m.get("name"): m for m in prev.get("markets", [])}
+                        for market in data.get("markets", []):
+                            merged[market.get("name")] = market
+                        data["markets"] = list(merged.values())
+                    latest[key] = data
+
+            for data in latest.values():
                 self.handle_event_message(data)
 
         except Exception as e:
-            logger.error(f"on_message error: {e}", exc_info=True)
+            logger.error("message batch error: %s", e, exc_info=True)
 
     def handle_event_message(self, data):
         # logger.info(f"Handling event message: {data}")
@@ -129,6 +293,15 @@ class OddsFinder:
         if data.get("type") not in ("created", "updated"):
             return
 
+        # Already bet on this event: skip before iterating any markets
+        if int(event_id) in self.value_events:
+            return
+
+        # Lowercase once per message, not once per odds entry
+        bookie_lc = bookie.lower()
+        is_duel = bookie_lc == "duel"
+        is_pinnacle = bookie_lc == "pinnacle"
+
         # logger.info(data)
 
         for market in data.get("markets", []):
@@ -143,6 +316,24 @@ class OddsFinder:
             if market_name not in self.markets:
                 continue
 
+            # Unchanged since we last saw it: nothing in this market can have
+            # moved, so skip it before any per-entry work
+            market_key = (event_id, bookie, market_name)
+            if self._last_market_update.get(market_key) == updated_at:
+                continue
+            self._last_market_update[market_key] = updated_at
+            if len(self._last_market_update) > self.max_market_updates:
+                self._last_market_update.pop(next(iter(self._last_market_update)))
+
+            # Freshness depends only on the market's updatedAt and the
+            # bookie, so check once per market rather than per selection
+            if is_duel and not is_within_one_minute(updated_at, 360):
+                continue
+            if is_pinnacle and not is_within_one_minute(updated_at, 10):
+                continue
+
+            market_slug = self._mkt_slug[market_name]
+
             for entry in market.get("odds", []):
                 hdp = entry.get("hdp")
                 if hdp is not None:
@@ -150,24 +341,20 @@ class OddsFinder:
                         continue
 
                 for key, value in entry.items():
-                    if key not in ("home", "away", "draw", "over", "under", 'yes','no'):
+                    if key not in VALID_SELECTIONS:
                         continue
 
                     try:
-                        float(value)
+                        price = float(value)
                     except:
                         continue
 
-                    if bookie.lower() == "duel":
-                        if float(value) < self.input_data['min_prematch_odd'] or float(value) > self.input_data['max_prematch_odd']:
-                            continue
-                        if not is_within_one_minute(updated_at, 360):
+                    if is_duel:
+                        if price < self._min_odd or price > self._max_odd:
                             continue
 
-                    if bookie.lower() == "pinnacle": #If pinnacle odds are above the max_prematch_odd, it can't give a value bet anyways, so skip
-                        if float(value) > self.input_data['max_prematch_odd']:
-                            continue 
-                        if not is_within_one_minute(updated_at, 10):
+                    if is_pinnacle: #If pinnacle odds are above the max_prematch_odd, it can't give a value bet anyways, so skip
+                        if price > self._max_odd:
                             continue
                     
                     if "Spread" in market_name and key == "away":
@@ -179,24 +366,18 @@ class OddsFinder:
                         "bookie": bookie, #different for Pinnacle and Duel
                         "market": market_name,
                         "selection": key,
-                        "price": float(value), #different for Pinnacle and Duel
+                        "price": price, #different for Pinnacle and Duel
                         "hdp": hdp,
                         "updated_at": updated_at
                     }
 
                     if hdp is None:
-                        uid = f"{event_id}-{key}-{market_name.replace(' ', '_')}"
+                        uid = f"{event_id}-{key}-{market_slug}"
                     else:
-                        uid = f"{event_id}-{key}-{market_name.replace(' ', '_')}-{hdp}"
+                        uid = f"{event_id}-{key}-{market_slug}-{hdp}"
 
                     record["uid"] = uid
                     self.process_bets(record)
-        if len(self.odds_store) > 200000:
-            logger.info(f"Odds store is too large ({len(self.odds_store)}), removing old records")
-            for record in self.odds_store:
-                if not is_less_than_24_hours_away(record['updated_at']):
-                    self.odds_store.remove(record)
-            logger.info(f"Odds store is now {len(self.odds_store)}")
 
     def process_bets(self, record):
         # print('Processing odds updates...')
@@ -205,62 +386,84 @@ class OddsFinder:
             # logger.info(f"Skipping event {record['event_id']} - value bet already found")
             return
 
-        duplicate = False
-        odds_update = False
-
-        for stored_record in self.odds_store:
-                same_id = (stored_record["uid"] == record["uid"] and stored_record["bookie"]  == record["bookie"]) 
+        key = (record["uid"], record["bookie"])
+        stored_record = self.odds_store.get(key)
 
-                if same_id:
-                    duplicate = True
-                    if stored_record["price"] != record["price"]:
-                        odds_update = True
-                        stored_record["price"] = record["price"]
-                        break
-                    else:
-                        return
-
-        if duplicate and odds_update:
+        if stored_record is not None:
+            self.odds_store.move_to_end(key)
+            stored_record["_touched"] = time.monotonic()
+            if stored_record["price"] == record["price"]:
+                return
+            stored_record["price"] = record["price"]
             self.compare_odds(record)
-        elif not duplicate:
-            self.odds_store.append(record)
-            # logger.info("Odds store:")
-            # if len(self.odds_store) > 5:
-            #     logger.info(self.odds_store[-5:])
-            # else:
-            #     logger.info(self.odds_store)
+        else:
+            record["_touched"] = time.monotonic()
+            self.odds_store[key] = record
+            self._expiry_queue.append((record["_touched"] + self.odds_ttl, key))
+            # Evict the least recently touched record once the cap is hit
+            if len(self.odds_store) > self.max_odds_store:
+                self.odds_store.popitem(last=False)
             self.compare_odds(record)
 
+    def _evict_expired(self):
+        # Called once per websocket message: the queue is ordered by deadline,
+        # so this only ever inspects the head. Records touched since their
+        # deadline was queued get re-armed instead of dropped.
+        now = time.monotonic()
+        queue = self._expiry_queue
+        while queue and queue[0][0] <= now:
+            _, key = queue.popleft()
+            stored_record = self.odds_store.get(key)
+            if stored_record is None:
+                continue  # already evicted by the LRU cap
+            deadline = stored_record["_touched"] + self.odds_ttl
+            if deadline > now:
+                queue.append((deadline, key))
+            else:
+                del self.odds_store[key]
+                # Also forget the market's last-seen updatedAt: without this
+                # the unchanged-market skip in handle_event_message would
+                # keep rejecting re-sent lines and the evicted record could
+                # never re-enter the store until the bookmaker moved it
+                self._last_market_update.pop(
+                    (stored_record["event_id"], stored_record["bookie"], stored_record["market"]),
+                    None)
+
     def compare_odds(self, record):
         # logger.info(f"No of events processed: {len(self.odds_store)}")
         event_id = record.get("event_id")
         # logger.info(f"{event_id}-{selection}-{market_name}")
 
-        related_entries = [entry for entry in self.odds_store if entry.get("uid") == record.get("uid")]
-        sportsbooks_data = {entry["bookie"]: entry for entry in related_entries}
-
-        # logger.info(self.odds_store[:5])
+        # Cheapest and most selective check first: skip resolved events before
+        # any odds pairing or API calls
+        if int(event_id) in self.value_events:
+            return None
 
-        # logger.info(f"event_id={event_id}, selection={selection}, market={market_name}")
-        # logger.info(f"related_entries={json.dumps(related_entries, indent=2)}")
-        # logger.info(f"sportsbooks_data keys={list(sportsbooks_data.keys())}")
-        if not all(sb in sportsbooks_data for sb in ["Duel", "Pinnacle"]):
+        # The store is keyed by (uid, bookie), so both sides of the pair are
+        # two direct lookups instead of a scan over every stored record
+        uid = record.get("uid")
+        duel_stored = self.odds_store.get((uid, "Duel"))
+        pinnacle_stored = self.odds_store.get((uid, "Pinnacle"))
+        if duel_stored is None or pinnacle_stored is None:
             return None
+        sportsbooks_data = {"Duel": duel_stored, "Pinnacle": pinnacle_stored}
 
-        logger.info('==================================================================')
-        logger.info('Found both Duel and Pinnacle odds pair....')
+        # One log call instead of separator + body: each emission takes the
+        # handler lock, formats a timestamp and writes to the log file
+        logger.info('==================================================================\n'
+                    'Found both Duel and Pinnacle odds pair....')
         duel_odds = sportsbooks_data["Duel"]["price"]
         pinnacle_odds = sportsbooks_data["Pinnacle"]["price"]
         value = calculate_value(duel_odds, pinnacle_odds) #value returned in percentage
 
         #feat: Implement minimum_value constant, so if value is below the Min_Value, skip it
-        if float(value) < self.input_data['min_value_percentage']:
+        if value < self._min_value:
         # if float(value) < 1:
             # print(f"Skipping game. {value}% is below minimum value {self.input_data['min_value_percentage']}%")
             return None
 
         sport, league, home, away, start_time = self.fetch_event_details(event_id) #This is the farthest place we can pull this API
-        logger.info(f"[{sport}] Value bet found for Duel with value: {value}%")
+        logger.info("[%s] Value bet found for Duel with value: %s%%", sport, value)
         # print(f"[{sport}] Value bet found for Duel with value: {value}%")
         duel_entry = sportsbooks_data["Duel"]
         pinnacle_entry = sportsbooks_data["Pinnacle"]
@@ -285,16 +488,22 @@ class OddsFinder:
         home = duel_entry.get("home")
         away = duel_entry.get("away")
         start_time = duel_entry.get("start_time")
-        found_valuebet_at = datetime.now(pytz.UTC).strftime("%Y-%m-%dT%H:%M:%SZ")
+        found_valuebet_at = datetime.now(_UTC).strftime("%Y-%m-%dT%H:%M:%SZ")
 
         if duel_entry['sport'].lower() == 'handball' and duel_entry['market'] == 'ML':
-            logger.info(f"Skipping Handball ML market")
-            return None
-        
-        if int(event_id) in self.value_events:
-            logger.info(f"Event {event_id} already processed")
+            logger.info("Skipping Handball ML market")
             return None
 
+        # Bind the fields reused below once instead of repeating the same
+        # dict lookups through the odds refresh, the alert dicts and the bet
+        duel_market = duel_entry.get("market")
+        duel_selection = duel_entry.get("selection")
+        duel_hdp = duel_entry.get("hdp")
+        pinnacle_market = pinnacle_entry.get("market")
+        pinnacle_selection = pinnacle_entry.get("selection")
+        pinnacle_hdp = pinnacle_entry.get("hdp")
+
+
         if is_less_than_24_hours_away(start_time): #Ensures only events starting within the next 24 hours are considered.
             if should_process_event(sport, start_time): # Filters out events that are too close to kickoff:
                 # For tennis, skip if it's starting in <45 min. For football, skip if it's starting in <2 min
@@ -304,21 +513,27 @@ class OddsFinder:
                     api_odds_data = get_event_odds(event_id)
                     duel_url = api_odds_data['urls']['Duel']
                     duel_event_id = duel_url.split('-')[-1]
-                    logger.info(json.dumps(api_odds_data, indent=2))
-
-                    duel_latest_odds = get_odds_from_data(
-                        api_odds_data,
+                    # The full odds payload is only useful when debugging; at
+                    # INFO it dominated the log and the pretty-print cost ran
+                    # on every candidate event
+                    if logger.isEnabledFor(logging.DEBUG):
+                        logger.debug(orjson.dumps(api_odds_data, option=orjson.OPT_INDENT_2).decode())
+
+                    # Index the payload once, then both lookups are dict hits
+                    odds_index = _build_odds_index(api_odds_data)
+                    duel_latest_odds = _odds_from_index(
+                        odds_index,
                         "Duel",
-                        duel_entry.get("market"),
-                        duel_entry.get("selection"),
-                        hdp_line=duel_entry.get("hdp")
+                        duel_market,
+                        duel_selection,
+                        hdp_line=duel_hdp
                     )
-                    pinnacle_latest_odds = get_odds_from_data(
-                        api_odds_data,
+                    pinnacle_latest_odds = _odds_from_index(
+                        odds_index,
                         "Pinnacle",
-                        pinnacle_entry.get("market"),
-                        pinnacle_entry.get("selection"),
-                        hdp_line=pinnacle_entry.get("hdp")
+                        pinnacle_market,
+                        pinnacle_selection,
+                        hdp_line=pinnacle_hdp
                     )
 
                     # Only recalculate if both are found and valid (not None)
@@ -327,7 +542,7 @@ class OddsFinder:
                         # Refresh the odds as well for further processing
                         duel_entry["price"] = duel_latest_odds
                         pinnacle_entry["price"] = pinnacle_latest_odds
-                        logger.info(f"Recalculated value with latest API odds: {value}% (Duel: {duel_latest_odds}, Pinnacle: {pinnacle_latest_odds})")
+                        logger.info("Recalculated value with latest API odds: %s%% (Duel: %s, Pinnacle: %s)", value, duel_latest_odds, pinnacle_latest_odds)
                     else:
                         logger.warning("Unable to fetch both Duel and Pinnacle odds from API for event_id {} (duel: {}, pinnacle: {})".format(
                             event_id, duel_latest_odds, pinnacle_latest_odds
@@ -335,13 +550,16 @@ class OddsFinder:
                         return None
 
                 except Exception as e:
-                    logger.error(f"Error fetching latest odds from API for event_id {event_id}: {e}", exc_info=True)
+                    logger.error("Error fetching latest odds from API for event_id %s: %s", event_id, e, exc_info=True)
                     return None
 
                 if value < self.input_data['min_value_percentage']:
-                    logger.info(f"Skipping game. Latest value is {value}%; below minimum value {self.input_data['min_value_percentage']}%")
+                    logger.info("Skipping game. Latest value is %s%%; below minimum value %s%%", value, self.input_data['min_value_percentage'])
                     return None
 
+                duel_price = duel_entry.get("price")
+                pinnacle_price = pinnacle_entry.get("price")
+
                 # duel value bet
                 duel_value_bet = {
                     "home_name": home,
@@ -349,18 +567,18 @@ class OddsFinder:
                     'event_id': event_id,
                     'uuid': duel_entry.get("uid"),
                     "league": duel_entry.get("league"),
-                    "market_name": duel_entry.get("market"),
-                    "selection": duel_entry.get("selection"),
-                    "pinnacle_odds": pinnacle_entry.get("price"),
-                    "duel_odds": duel_entry.get("price"),
+                    "market_name": duel_market,
+                    "selection": duel_selection,
+                    "pinnacle_odds": pinnacle_price,
+                    "duel_odds": duel_price,
                     'value': value,
                     "sport": duel_entry.get("sport"),
-                    "hdp": duel_entry.get("hdp"),
+                    "hdp": duel_hdp,
                     'start_time': start_time,
                     "duel_odds_updated_at": duel_entry.get("updated_at"),
                     "found_valuebet_at": found_valuebet_at
                 }
-                
+
 
                 # Pinnacle value bet
                 pinnacle_value_bet = {
@@ -369,25 +587,28 @@ class OddsFinder:
                     'event_id': event_id,
                     'uuid': pinnacle_entry.get("uid"),
                     "league": pinnacle_entry.get("league"),
-                    "market_name": pinnacle_entry.get("market"),
-                    "selection": pinnacle_entry.get("selection"),
-                    "odds": pinnacle_entry.get("price"),
+                    "market_name": pinnacle_market,
+                    "selection": pinnacle_selection,
+                    "odds": pinnacle_price,
                     "sportsbook": "pinnacle",
                     "sport": pinnacle_entry.get("sport"),
-                    "hdp": pinnacle_entry.get("hdp"),
+                    "hdp": pinnacle_hdp,
                     'pinnacle_odds_updated_at': pinnacle_entry.get("updated_at")
                 }
 
                 # print at once so it doesn't mix up
-                logger.info(f"[{sport}] Value bet pair found\n"
-                            f"----- VALUE BET SIDE (duel) -----\n"
-                            f"{json.dumps(duel_value_bet, indent=2, ensure_ascii=False)}\n"
-                            f"----- CORRESPONDING PINNACLE SIDE -----\n"
-                            f"{json.dumps(pinnacle_value_bet, indent=2, ensure_ascii=False)}\n"
-                            f"------------------------------------------")
+                # orjson is much faster than stdlib json for the pretty-print, and the
+                # isEnabledFor guard skips the formatting entirely if INFO is filtered out
+                if logger.isEnabledFor(logging.INFO):
+                    logger.info(f"[{sport}] Value bet pair found\n"
+                                f"----- VALUE BET SIDE (duel) -----\n"
+                                f"{orjson.dumps(duel_value_bet, option=orjson.OPT_INDENT_2).decode()}\n"
+                                f"----- CORRESPONDING PINNACLE SIDE -----\n"
+                                f"{orjson.dumps(pinnacle_value_bet, option=orjson.OPT_INDENT_2).decode()}\n"
+                                f"------------------------------------------")
                 print('>>> Value bet pair found')
 
-                logger.info(f">>> Fetching latest odds for value event {event_id}")
+                logger.info(">>> Fetching latest odds for value event %s", event_id)
                 
                 # Use DuelClient to place bet
                 if not self.duel_client:
@@ -400,18 +621,16 @@ class OddsFinder:
                     bet_response = self.duel_client.place_bet_sync(
                         duel_event_id=duel_event_id,
                         sport=sport,
-                        market_name=duel_entry.get("market"),
-                        selection=duel_entry.get("selection"),
-                        hdp=duel_entry.get("hdp"),
-                        odds=duel_entry.get("price")
+                        market_name=duel_market,
+                        selection=duel_selection,
+                        hdp=duel_hdp,
+                        odds=duel_price
                     )
-                    time.sleep(5)
-                    
                     if bet_response.get('error') == []:
-                        logger.info(f"Bet placed successfully for event")
-                        settled_odds, balance = self.duel_client.get_bet_odds(duel_event_id)
+                        logger.info("Bet placed successfully for event")
+                        settled_odds, balance = self._wait_for_settled_odds(duel_event_id)
                     elif bet_response.get('error') == "expired_token":
-                        logger.error(f"Token expired, attempting to refresh token")
+                        logger.error("Token expired, attempting to refresh token")
                         # Try to refresh token
                         self.duel_client.get_auth_token(force_refresh=True)
                         play_notification_sound("alarm.wav", async_play=False)
@@ -419,22 +638,23 @@ class OddsFinder:
                         bet_response = self.duel_client.place_bet(
                             duel_event_id=duel_event_id,
                             sport=sport,
-                            market_name=duel_entry.get("market"),
-                            selection=duel_entry.get("selection"),
-                            hdp=duel_entry.get("hdp"),
-                            odds=duel_entry.get("price")
+                            market_name=duel_market,
+                            selection=duel_selection,
+                            hdp=duel_hdp,
+                            odds=duel_price
                         )
                         if bet_response.get('error') == []:
-                            settled_odds, balance = self.duel_client.get_bet_odds(duel_event_id)
+                            settled_odds, balance = self._wait_for_settled_odds(duel_event_id)
                     else:
-                        logger.error(f"Error placing bet: {bet_response}")
-                        for record in self.odds_store:
-                            if record['uid'] == duel_entry.get("uid"):
-                                self.odds_store.remove(record)
-                        
+                        logger.error("Error placing bet: %s", bet_response)
+                        # Only the two bookies' records can exist for this
+                        # uid, so pop them directly instead of scanning
+                        self.odds_store.pop((uid, "Duel"), None)
+                        self.odds_store.pop((uid, "Pinnacle"), None)
+
                         return None
                 except Exception as e:
-                    logger.error(f"Error placing bet: {e}", exc_info=True)
+                    logger.error("Error placing bet: %s", e, exc_info=True)
                     return None
                     
                 
@@ -457,38 +677,76 @@ class OddsFinder:
                     settled_odds,
                     balance
                 ]
-                self.value_events.append(int(event_id))
-                update_log_to_sheet([alert_data], self.worksheet)
+                self.value_events.add(int(event_id))
+                self._queue_alert(alert_data)
 
                 
                 
                 return duel_value_bet #not returning Pinnacle data
             else:
-                logger.info(f"[{sport}] kickout too soon @ {start_time}")
+                logger.info("[%s] kickout too soon @ %s", sport, start_time)
         else:
-            logger.info(f"[{sport}] Event isn't starting in the next 24 hours @ {start_time}")
+            logger.info("[%s] Event isn't starting in the next 24 hours @ %s", sport, start_time)
+
+    def _queue_alert(self, alert_data):
+        """Buffer a sheet row, flushing once the batch is big or old enough"""
+        self._alert_buffer.append(alert_data)
+        if len(self._alert_buffer) >= 25 or time.monotonic() - self._last_flush > 30:
+            self._flush_alerts()
+
+    def _flush_alerts(self):
+        if not self._alert_buffer:
+            return
+        update_log_to_sheet(self._alert_buffer, self.worksheet)
+        self._alert_buffer = []
+        self._last_flush = time.monotonic()
+
+    def _wait_for_settled_odds(self, duel_event_id, attempts=50, delay=0.1):
+        """Poll the placed bet until its settled odds appear.
+
+        Replaces a flat 5-second sleep after placement: most bets settle much
+        sooner, so poll in short intervals and return as soon as the odds are
+        available (or give up after attempts * delay seconds).
+        """
+        settled_odds = balance = None
+        for _ in range(attempts):
+            settled_odds, balance = self.duel_client.get_bet_odds(duel_event_id)
+            if settled_odds is not None:
+                break
+            time.sleep(delay)
+        return settled_odds, balance
 
     def fetch_event_details(self, event_id: str, max_retries: int = 5):
+        # Sport/league/teams/start time never change for an event, so a
+        # repeat lookup within the TTL is answered from the cache instead of
+        # burning another rate-limited API call
+        cached = self._event_meta_cache.get(event_id)
+        if cached is not None:
+            details, cached_at = cached
+            if time.monotonic() - cached_at < self._event_meta_ttl:
+                return details
+            del self._event_meta_cache[event_id]
+
         event_url = f"https://api.odds-api.io/v3/events/{event_id}"
-        params = {"apiKey": self.api_key}
-        
+        params = self._event_params
+
         retry_delay = 1  # start with 1 second
         for attempt in range(1, max_retries + 1):
             try:
-                response = requests.get(
-                    event_url, 
-                    params=params, 
+                response = http_session.get(
+                    event_url,
+                    params=params,
                     timeout=5
                 )
                 
                 if response.status_code == 429:
-                    logger.warning(f"Rate limit hit for event {event_id}, retrying in {retry_delay}s (attempt {attempt}/{max_retries})")
+                    logger.warning("Rate limit hit for event %s, retrying in %ss (attempt %s/%s)", event_id, retry_delay, attempt, max_retries)
                     time.sleep(retry_delay)
                     retry_delay *= 2  # exponential backoff
                     continue
 
                 response.raise_for_status()
-                event = response.json()
+                event = orjson.loads(response.content)
 
                 sport = event.get('sport', {}).get('name', 'Unknown')
                 league = event.get('league', {}).get('name', 'Unknown')
@@ -496,23 +754,29 @@ class OddsFinder:
                 away = event.get('away', None)
                 date = event.get('date', None)
 
-                return sport, league, home, away, date
+                details = (sport, league, home, away, date)
+                # Only successful lookups are cached; failures fall through
+                # below and return the Unknown tuple uncached so they retry
+                self._event_meta_cache[event_id] = (details, time.monotonic())
+                if len(self._event_meta_cache) > 5_000:
+                    self._event_meta_cache.pop(next(iter(self._event_meta_cache)))
+                return details
 
             except requests.RequestException as e:
-                logger.error(f"API request error for event {event_id}: {e}")
+                logger.error("API request error for event %s: %s", event_id, e)
                 if attempt == max_retries:
                     return "Unknown", "Unknown", "Unknown", "Unknown", None
                 time.sleep(retry_delay)
                 retry_delay *= 2
             except Exception as e:
-                logger.error(f"Error fetching event {event_id}: {e}", exc_info=True)
+                logger.error("Error fetching event %s: %s", event_id, e, exc_info=True)
                 if attempt == max_retries:
                     return "Unknown", "Unknown", "Unknown", "Unknown", None
                 time.sleep(retry_delay)
                 retry_delay *= 2
 
         # If we exit the loop without returning, retries failed
-        logger.error(f"Max retries reached for event {event_id}")
+        logger.error("Max retries reached for event %s", event_id)
         return "Unknown", "Unknown", "Unknown", "Unknown", None
 
 
@@ -521,7 +785,7 @@ class OddsFinder:
         print(f"[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] WebSocket Error: {error}")
 
     def on_close(self, ws, close_status_code, close_msg):
-        logger.info(f"WebSocket closed (code: {close_status_code}, msg: {close_msg})")
+        logger.info("WebSocket closed (code: %s, msg: %s)", close_status_code, close_msg)
         print(f"[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] WebSocket closed")
 
     def build_ws_url(self) -> str:
@@ -536,10 +800,14 @@ class OddsFinder:
         print("Starting OddsFinder WebSocket Monitor")
         print("Press Ctrl+C to stop gracefully")
         print("=" * 80)
-        
+
+        # Start the processing worker once; it survives reconnects
+        self._worker_thread = threading.Thread(target=self._process_messages, daemon=True)
+        self._worker_thread.start()
+
         while self.is_running:
             try:
-                logger.info(f"Attempting WebSocket connection (attempt {reconnect_count + 1})...")
+                logger.info("Attempting WebSocket connection (attempt %s)...", reconnect_count + 1)
                 print(f"[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] Connecting to WebSocket...")
                 
                 self.ws = websocket.WebSocketApp(
@@ -552,9 +820,12 @@ class OddsFinder:
                 
                 # The connection will be established in on_open callback
                 # on_open will reset self.backoff on successful connection
+                # skip_utf8_validation: the feed is known-good UTF-8 and
+                # validation is pure per-byte overhead on every frame
                 self.ws.run_forever(
                     ping_interval=30,
-                    ping_timeout=10
+                    ping_timeout=10,
+                    skip_utf8_validation=True
                 )
                 
                 # If we get here, connection was closed
@@ -563,7 +834,7 @@ class OddsFinder:
                     break
                     
                 reconnect_count += 1
-                logger.warning(f"WebSocket disconnected. Reconnecting in {self.backoff} seconds...")
+                logger.warning("WebSocket disconnected. Reconnecting in %s seconds...", self.backoff)
                 print(f"[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] Reconnecting in {self.backoff} seconds...")
                 time.sleep(self.backoff)
                 
@@ -576,7 +847,7 @@ class OddsFinder:
                 self.stop()
                 break
             except Exception as e:
-                logger.error(f"Unexpected error in WebSocket connection: {e}", exc_info=True)
+                logger.error("Unexpected error in WebSocket connection: %s", e, exc_info=True)
                 # print(f"[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] Error: {e}. Retrying in {self.backoff} seconds...")
                 time.sleep(self.backoff)
                 self.backoff = min(self.backoff * 2, max_backoff)
@@ -590,6 +861,11 @@ class OddsFinder:
                 self.ws.close()
             except:
                 pass
+        # Don't lose buffered alerts on shutdown
+        try:
+            self._flush_alerts()
+        except Exception as e:
+            logger.error("Error flushing alerts on shutdown: %s", e, exc_info=True)
         logger.info("OddsFinder stopped")
 
 
@@ -610,14 +886,61 @@ def get_event_odds(event_id):
         "eventId": event_id,
         "bookmakers": 'Pinnacle,Duel',
         # 'sport': 'Handball',
-        # 'since': int((datetime.now(pytz.UTC) - timedelta(seconds=30)).timestamp())
+        # 'since': int((datetime.now(_UTC) - timedelta(seconds=30)).timestamp())
     }
-    response = requests.get(url, params=params)
+    response = http_session.get(url, params=params, timeout=10)
     # response.raise_for_status()
     if response.status_code != 200:
-        logger.error(f"Error fetching latest odds from API for event_id {event_id}: {response.text}")
+        logger.error("Error fetching latest odds from API for event_id %s: %s", event_id, response.text)
         return []
-    return response.json()
+    return orjson.loads(response.content)
+
+
+def _build_odds_index(data: Dict[str, Any]) -> Dict[str, Dict[str, list]]:
+    """Index an API odds payload by bookmaker and market name.
+
+    get_odds_from_data re-walks the bookmaker's market list on every call;
+    when the same payload is queried for both sides of a pair, building this
+    index once turns each lookup into two dict hits.
+    """
+    index = {}
+    for bookmaker_name, markets in (data.get('bookmakers') or {}).items():
+        index[bookmaker_name] = {m.get('name'): m.get('odds', []) for m in markets}
+    return index
+
+
+def _odds_from_index(
+    index: Dict[str, Dict[str, list]],
+    bookmaker_name: str,
+    market_name: str,
+    selection: str,
+    hdp_line: Optional[float] = None
+) -> Optional[float]:
+    """Like get_odds_from_data, but against a prebuilt _build_odds_index."""
+    try:
+        odds_list = index.get(bookmaker_name, {}).get(market_name)
+        if not odds_list:
+            return None
+
+        if hdp_line is not None:
+            # For markets with lines (Totals, Spread, etc.), find matching hdp
+            odds_entry = next((entry for entry in odds_list if entry.get('hdp') == hdp_line), None)
+        else:
+            # For markets without lines (ML), use the first entry
+            odds_entry = odds_list[0]
+
+        if not odds_entry:
+            return None
+
+        odds_value = odds_entry.get(selection)
+        if odds_value is None:
+            return None
+
+        return float(odds_value)
+
+    except (KeyError, ValueError, TypeError) as e:
+        print(f"Error extracting odds: {e}")
+        return None
 
 
 def get_odds_from_data(
@@ -701,86 +1024,119 @@ def get_odds_from_data(
         return None
 
 def calculate_value(slower_odds, sharp_odds):
-    value = (float(slower_odds) - float(sharp_odds))*100/(float(sharp_odds))
-    value = round(value, 2)
-    return value
+    # Convert each operand once; this runs for every paired price update
+    sharp = float(sharp_odds)
+    return round((float(slower_odds) - sharp) * 100.0 / sharp, 2)
+
+# Duel market names that go by a different name on the stream; extend here
+# rather than adding branches to transpose_duel_market_name
+_MARKET_ALIAS = {
+    "First Set Winner": "ML 1st Set",
+}
+
 
 def transpose_duel_market_name(market_name):
-    if market_name == "First Set Winner":
-        return 'ML 1st Set'
+    return _MARKET_ALIAS.get(market_name, market_name)
+@functools.lru_cache(maxsize=4096)
+def _parse_iso(time_str):
+    """Parse a UTC timestamp like 2025-01-17T20:00:00Z (with or without
+    milliseconds) into an aware datetime.
+
+    The stream repeats the same updatedAt/start-time strings across many
+    odds entries, so the results are memoized: the parse only runs the first
+    time a given string is seen. Uses ciso8601's C parser when installed,
+    then datetime.fromisoformat (also C on CPython), with strptime as the
+    last resort for anything the fast parsers reject.
+    """
+    if ciso8601 is not None:
+        try:
+            parsed = ciso8601.parse_datetime(time_str)
+        except ValueError:
+            parsed = None
+        if parsed is not None:
+            return parsed if parsed.tzinfo is not None else parsed.replace(tzinfo=_UTC)
+    try:
+        parsed = datetime.fromisoformat(time_str.replace("Z", "+00:00"))
+    except ValueError:
+        pass
     else:
-        return market_name
+        return parsed if parsed.tzinfo is not None else parsed.replace(tzinfo=_UTC)
+    for fmt in ("%Y-%m-%dT%H:%M:%SZ", "%Y-%m-%dT%H:%M:%S.%fZ"):
+        try:
+            return datetime.strptime(time_str, fmt).replace(tzinfo=_UTC)
+        except ValueError:
+            continue
+    raise ValueError(f"Time string {time_str} not in recognized ISO format")
+
+
 def is_less_than_24_hours_away(time_str):
     # Parse the input time string into a datetime object
-    time_format = "%Y-%m-%dT%H:%M:%SZ"
-    given_time = datetime.strptime(time_str, time_format).replace(tzinfo=pytz.UTC)
+    given_time = _parse_iso(time_str)
 
     # Get the current time in UTC
-    current_time = datetime.now(pytz.UTC)
+    current_time = datetime.now(_UTC)
     
     # Calculate the time difference
     time_difference = given_time - current_time
     
     # Ensure event is in the future and less than 24 hours away
-    return timedelta(0) < time_difference <= timedelta(hours=48)
+    return _TD_ZERO < time_difference <= _TD_48H
 
 def is_within_one_minute(time_str, minute_val = 2):
     """Returns True if the given UTC time string is within the last minute from now, else False."""
     
 
     # Accepts both with and without milliseconds
-    time_formats = ["%Y-%m-%dT%H:%M:%S.%fZ", "%Y-%m-%dT%H:%M:%SZ"]
-    given_time = None
-    for fmt in time_formats:
-        try:
-            given_time = datetime.strptime(time_str, fmt).replace(tzinfo=pytz.UTC)
-            break
-        except ValueError:
-            continue
-    if given_time is None:
-        raise ValueError(f"Time string {time_str} not in recognized ISO format")
-    now = datetime.now(pytz.UTC)
+    given_time = _parse_iso(time_str)
+    now = datetime.now(_UTC)
     delta = now - given_time
-    return timedelta(0) <= delta <= timedelta(minutes=minute_val)
+    limit = _TD_MINUTES.get(minute_val)
+    if limit is None:
+        limit = _TD_MINUTES.setdefault(minute_val, timedelta(minutes=minute_val))
+    return _TD_ZERO <= delta <= limit
 
 
 
 def should_process_event(sport, time_str):
-    time_format = "%Y-%m-%dT%H:%M:%SZ"
-    given_time = datetime.strptime(time_str, time_format).replace(tzinfo=pytz.UTC)
-    current_time = datetime.now(pytz.UTC)
+    given_time = _parse_iso(time_str)
+    current_time = datetime.now(_UTC)
     time_until_event_start = given_time - current_time
 
     # Skip events that have already started
-    if time_until_event_start <= timedelta(0):
+    if time_until_event_start <= _TD_ZERO:
         return False
 
-    if (sport.lower() == "tennis" and time_until_event_start > timedelta(minutes=45)) \
-       or (sport.lower() in ["football", "basketball", 'baseball', "american football", "ice hockey", "esports", "handball", "rugby", "volleyball", 'badminton', 'beach soccer', 'beach volleyball', 'table tennis'] and time_until_event_start > timedelta(minutes=2)):
+    sport_lc = sport.lower()
+    if (sport_lc == "tennis" and time_until_event_start > _TD_45M) \
+       or (sport_lc in _SHORT_LEAD_SPORTS and time_until_event_start > _TD_2M):
         return True
-    
+
     return False
 
 
 def update_log_to_sheet(alert_list, worksheet):
     """Update Google Sheet with value bet alerts"""
     try:
-        rows = worksheet.get_all_values(
-            include_tailing_empty=True, 
-            include_tailing_empty_rows=False, 
-            returnas='matrix'
-        )
-        row_index = len(rows) + 1
-        no_of_alerts = len(alert_list)
-        worksheet.update_values(f"A{row_index}:P{row_index+no_of_alerts}", alert_list)
-        logger.info(f"Successfully saved {no_of_alerts} value bet(s) to Google Sheet")
+        # append_table finds the end of the data server-side, so there is no
+        # need to download the whole sheet just to learn the next free row
+        worksheet.append_table(values=alert_list, start='A1', dimension='ROWS', overwrite=False)
+        logger.info("Successfully saved %s value bet(s) to Google Sheet", len(alert_list))
     except Exception as e:
-        logger.error(f"Error updating Google Sheet: {e}", exc_info=True)
+        logger.error("Error updating Google Sheet: %s", e, exc_info=True)
 
 
 # place_bet and get_bet_odds functions have been moved to DuelClient class
 
 def main():
+    # Configured here rather than at import time so importing this module
+    # (e.g. test.py pulling in get_event_odds) doesn't hijack the host's
+    # root logging
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(asctime)s [%(levelname)s] %(name)s: %(message)s",
+        datefmt="%Y-%m-%d %H:%M:%S",
+        filename="OddsFinder.log")
+
     # Setup signal handler for graceful shutdown
     duel_client = None
     finder = None
@@ -813,12 +1169,13 @@ def main():
             include_tailing_empty_rows=False, 
             returnas='matrix'
         )
-        sent_bets = []
+        # Built as a set: OddsFinder only ever membership-tests these
+        sent_bets = set()
         if len(temp_rows) > 1:  # Skip header row
             for row in temp_rows[1:]:
                 if len(row) > 4 and row[4]:  # Check if event_id exists
                     try:
-                        sent_bets.append(int(row[4]))
+                        sent_bets.add(int(row[4]))
                     except (ValueError, IndexError):
                         continue
         
@@ -832,11 +1189,11 @@ def main():
             'min_value_percentage': float(min_value_percentage)
         }
         
-        logger.info(f"Loaded input data: {input_data}")
-        logger.info(f"Loaded {len(sent_bets)} previously sent bets")
+        logger.info("Loaded input data: %s", input_data)
+        logger.info("Loaded %s previously sent bets", len(sent_bets))
         
     except Exception as e:
-        logger.error(f"Error initializing Google Sheets: {e}", exc_info=True)
+        logger.error("Error initializing Google Sheets: %s", e, exc_info=True)
         raise
     
     # Get API key
@@ -844,6 +1201,15 @@ def main():
     if not api_key:
         raise ValueError("Missing ODDS_API_KEY in environment variables")
     
+    # Use uvloop for the event loop where available (not on Windows); purely
+    # optional, the stdlib loop works the same without it
+    try:
+        import uvloop
+        uvloop.install()
+        logger.info("Using uvloop event loop")
+    except ImportError:
+        pass
+
     # Initialize DuelClient (async)
     try:
         logger.info("Initializing DuelClient...")
@@ -856,7 +1222,7 @@ def main():
         loop.run_until_complete(duel_client.initialize())
         logger.info("DuelClient initialized successfully")
     except Exception as e:
-        logger.error(f"Error initializing DuelClient: {e}", exc_info=True)
+        logger.error("Error initializing DuelClient: %s", e, exc_info=True)
         logger.warning("Continuing without DuelClient - betting will not be automated")
         duel_client = None
         return
@@ -877,7 +1243,7 @@ def main():
             logger.info("Starting OddsFinder in background thread...")
             finder.start()
         except Exception as e:
-            logger.error(f"Fatal error in OddsFinder thread: {e}", exc_info=True)
+            logger.error("Fatal error in OddsFinder thread: %s", e, exc_info=True)
         finally:
             if finder:
                 finder.stop()
@@ -892,15 +1258,13 @@ def main():
         logger.info("Main thread running to maintain DuelClient and token refresh...")
         logger.info("Press Ctrl+C to stop")
         
-        # Run async event loop in main thread
+        # Run async event loop in main thread. Token refresh runs as its own
+        # asyncio task inside DuelClient, so this loop only watches the
+        # finder thread and can wake up far less often
         async def run_main_loop():
             while True:
-                await asyncio.sleep(1)
-                
-                # Check if token refresh is needed
-                if duel_client:
-                    await duel_client.refresh_token_if_needed()
-                
+                await asyncio.sleep(5)
+
                 # Check if finder thread is still alive
                 if not finder_thread.is_alive():
                     logger.warning("OddsFinder thread has stopped")
@@ -912,7 +1276,7 @@ def main():
     except KeyboardInterrupt:
         logger.info("Received interrupt signal in main thread")
     except Exception as e:
-        logger.error(f"Error in main thread: {e}", exc_info=True)
+        logger.error("Error in main thread: %s", e, exc_info=True)
     finally:
         if finder:
             finder.stop()